@@ -56,6 +56,18 @@ def create_vector_index():
             print("  - willow_memory (Label: Memory)")
             print("  - willow_ideas (Label: Idea)")
             
+            # Full-text (BM25) index for exact identifiers, hostnames and skill names
+            # that vector similarity misses - search_memory_hybrid fuses both rankings
+            print("Creating Full-text Index 'willow_memory_text'...")
+            session.run("""
+                CREATE FULLTEXT INDEX willow_memory_text IF NOT EXISTS
+                FOR (m:Memory|Decision|Idea|Insight)
+                ON EACH [m.title, m.content]
+            """)
+            
+            print("✓ Full-text Index created.")
+            print("  - willow_memory_text (Labels: Memory, Decision, Idea, Insight; title, content)")
+            
     except Exception as e:
         print(f"Error creating index: {e}")
     finally:
@@ -8,6 +8,7 @@ import os
 import sys
 from neo4j import GraphDatabase
 import certifi
+import requests
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from core.skills import get_task_context
@@ -173,6 +174,7 @@ class FeatureAgent:
                 })
             """, task_name=self.context['task']['name'], status=status, notes=notes)
         
+        self.invalidate_api_cache(["DiaryEntry"])
         print(f"📝 Logged to diary: {notes[:60]}...")
     
     def mark_complete(self):
@@ -184,8 +186,17 @@ class FeatureAgent:
                     t.completed_at = datetime()
             """, task_name=self.context['task']['name'])
         
+        self.invalidate_api_cache(["Task"])
         print(f"✅ Task marked complete: {self.context['task']['name']}")
     
+    def invalidate_api_cache(self, labels):
+        """Tell willow-api to drop cached skill results that read these labels"""
+        api_url = os.getenv('WILLOW_API_URL', 'http://localhost:8000')
+        try:
+            requests.post(f"{api_url}/cache/invalidate", json={"labels": labels}, timeout=2)
+        except requests.RequestException:
+            pass  # API not running - its cache will expire on TTL
+    
     def close(self):
         """Close database connection"""
         self.driver.close()
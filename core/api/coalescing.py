@@ -0,0 +1,70 @@
+"""
+Willow API - Request Coalescing
+Single-flight: identical concurrent skill calls share one in-flight execution
+"""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+def call_key(skill_name: str, parameters: Dict[str, Any]) -> str:
+    """Stable key for a skill call (parameter order doesn't matter)"""
+    return json.dumps([skill_name, parameters], sort_keys=True, default=str)
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key
+
+    The first caller starts the work; anyone arriving with the same key while it
+    is still running awaits the same result (or exception). The shared work is
+    only cancelled once every waiter has gone away.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.shared_calls = 0
+
+    async def do(self, key: str, work: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run work() for this key, or join the call already in flight
+
+        Returns:
+            (result, shared) - shared is True if this caller joined an existing call
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(work()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self.shared_calls += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, key: str, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Mark the exception retrieved in case every waiter was cancelled first
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._flights)
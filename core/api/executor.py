@@ -0,0 +1,343 @@
+"""
+Willow API - Skill Execution Engine
+Runs skills off the event loop in bounded pools with per-skill concurrency caps and timeouts
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from coalescing import SingleFlight, call_key
+from metrics import COALESCED_CALLS, RESULT_CACHE_LOOKUPS, SKILL_DURATION, SKILL_ERRORS, SKILL_IN_FLIGHT
+from module_cache import ModuleCache
+from profiling import measure_serialize, profile_call
+from result_cache import ResultCache, is_success
+from skill_registry import SkillParameterError, SkillRegistry
+
+SKILL_THREAD_WORKERS = int(os.getenv("SKILL_THREAD_WORKERS", "16"))
+SKILL_PROCESS_WORKERS = int(os.getenv("SKILL_PROCESS_WORKERS", "2"))
+SKILL_DEFAULT_TIMEOUT = float(os.getenv("SKILL_DEFAULT_TIMEOUT", "60"))
+SKILL_DEFAULT_CONCURRENCY = int(os.getenv("SKILL_DEFAULT_CONCURRENCY", "4"))
+
+# Skills declare overrides with a literal module-level SKILL_CONFIG dict (read from source by
+# the registry, never by importing the skill), e.g.
+#   SKILL_CONFIG = {"pool": "process", "max_concurrency": 1, "timeout": 600}
+# Read-only skills usually set "coalesce" and "cache_ttl" plus the "reads" their results depend
+# on; skills that write list their labels in "writes" so those cached results are dropped.
+# Long-running skills raise "timeout" (and keep max_concurrency low).
+DEFAULT_SKILL_CONFIG = {
+    "pool": "thread",  # "thread" for I/O-bound skills, "process" for CPU-bound skills
+    "max_concurrency": SKILL_DEFAULT_CONCURRENCY,
+    "timeout": SKILL_DEFAULT_TIMEOUT,  # wall-clock seconds, None to disable
+    "job_timeout": None,  # wall-clock seconds when run through /jobs, None for no limit
+    "coalesce": False,  # share one execution between identical concurrent calls (read-only skills only)
+    "cache_ttl": None,  # seconds to cache successful results (read-only skills only), None to disable
+    "reads": [],  # graph labels a cached result depends on
+    "writes": [],  # graph labels this skill modifies - invalidates cached results reading them ("*" for all)
+}
+
+
+class SkillTimeoutError(TimeoutError):
+    """Raised when a skill doesn't finish (or can't start) within its timeout"""
+
+
+def skill_config(overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge a skill's SKILL_CONFIG over the defaults"""
+    config = dict(DEFAULT_SKILL_CONFIG)
+    config.update(overrides or {})
+
+    if config["pool"] not in ("thread", "process"):
+        raise ValueError(f"Unknown skill pool '{config['pool']}' (expected 'thread' or 'process')")
+
+    return config
+
+
+# Each worker process keeps its own module cache so CPU skills are only imported once per worker
+_process_module_cache: Optional[ModuleCache] = None
+
+
+def _run_in_process(skills_dir: str, skill_name: str, parameters: Dict[str, Any]) -> Any:
+    """Entry point for process-pool skills (must be top-level so it can be pickled)"""
+    global _process_module_cache
+    if _process_module_cache is None:
+        _process_module_cache = ModuleCache(Path(skills_dir))
+
+    module = _process_module_cache.get(skill_name)
+    return module.execute(**parameters)
+
+
+class SkillExecutor:
+    """
+    Dispatches skill calls to a thread pool (I/O skills) or process pool (CPU skills)
+
+    Each skill gets its own concurrency cap. A slot is held until the underlying
+    work actually finishes, so a skill that timed out but is still running keeps
+    counting against its cap instead of letting more copies pile up behind it.
+    """
+
+    def __init__(self, module_cache: ModuleCache, registry: SkillRegistry):
+        self.module_cache = module_cache
+        self.registry = registry
+        self._threads = ThreadPoolExecutor(max_workers=SKILL_THREAD_WORKERS, thread_name_prefix="skill")
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._slots: Dict[str, Tuple[int, asyncio.Semaphore]] = {}
+        self._running: Dict[str, int] = {}
+        self._single_flight = SingleFlight()
+        self.result_cache = ResultCache()
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        # Created lazily - most deployments never run a CPU-bound skill
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(
+                max_workers=SKILL_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._processes
+
+    def _slot(self, skill_name: str, max_concurrency: int) -> asyncio.Semaphore:
+        # A new cap (skill edited and reloaded) gets a fresh semaphore; calls
+        # already holding the old one release into it harmlessly
+        cap, slot = self._slots.get(skill_name, (None, None))
+        if cap != max_concurrency:
+            slot = asyncio.Semaphore(max_concurrency)
+            self._slots[skill_name] = (max_concurrency, slot)
+        return slot
+
+    async def load(self, skill_name: str):
+        """Load (or fetch from cache) a skill module without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._threads, self.module_cache.get, skill_name)
+
+    async def run(
+        self,
+        skill_name: str,
+        parameters: Dict[str, Any],
+        timeout: Optional[float] = None,
+        job: bool = False,
+        progress: Optional[Callable] = None,
+        on_start: Optional[Callable[[], None]] = None
+    ) -> Any:
+        """
+        Execute a skill and return its result
+
+        Parameters are checked against the registry's signature before the skill
+        is imported or queued.
+
+        Args:
+            skill_name: Name of the skill to execute
+            parameters: Keyword arguments for the skill's execute()
+            timeout: Optional caller timeout in seconds (can only shorten the skill's own timeout)
+            job: Running as a background job - use the skill's job_timeout instead of timeout
+            progress: Optional progress callback, passed to thread-pool skills that accept one
+            on_start: Called once the skill has a concurrency slot and is submitted to its pool
+
+        Returns:
+            Whatever the skill's execute() returned
+        """
+        started = time.monotonic()
+        try:
+            parameters = self.registry.validate(skill_name, parameters)
+        except SkillParameterError:
+            # Only for skills that exist - unknown names would make unbounded label values
+            SKILL_ERRORS.labels(skill=skill_name, exception="SkillParameterError").inc()
+            raise
+        info = self.registry.get(skill_name)
+        config = skill_config(info.config)
+
+        if progress is not None and info.accepts_progress and config["pool"] == "thread":
+            parameters["progress"] = progress
+
+        cache_ttl = None if job else config["cache_ttl"]
+        if cache_ttl:
+            # Keyed on the skill's content hash too, so editing a skill retires its old results
+            cache_key = f"{info.content_hash}:{call_key(skill_name, parameters)}"
+            hit, cached = self.result_cache.get(cache_key)
+            RESULT_CACHE_LOOKUPS.labels(skill=skill_name, result="hit" if hit else "miss").inc()
+            if hit:
+                return cached
+            generation = self.result_cache.generation
+
+        def execute() -> Awaitable[Any]:
+            return self._tracked(
+                skill_name,
+                config,
+                lambda: self._dispatch(skill_name, parameters, config, started, timeout, job, on_start=on_start)
+            )
+
+        if config["coalesce"] and not job and "progress" not in parameters:
+            # Identical concurrent calls share the first caller's execution (and its timeout).
+            # The execution is tracked inside the flight, so it is measured once however many callers joined.
+            result, shared = await self._single_flight.do(call_key(skill_name, parameters), execute)
+            if shared:
+                COALESCED_CALLS.labels(skill=skill_name).inc()
+        else:
+            result = await execute()
+
+        if cache_ttl and is_success(result):
+            self.result_cache.put(cache_key, skill_name, result, cache_ttl, config["reads"], generation)
+
+        return result
+
+    async def _tracked(
+        self,
+        skill_name: str,
+        config: Dict[str, Any],
+        dispatch: Callable[[], Awaitable[Any]],
+        result_of: Callable[[Any], Any] = lambda outcome: outcome
+    ) -> Any:
+        """
+        Await dispatch() with what every execution gets, profiled or not: the
+        in-flight gauge, duration/error metrics and invalidation of the labels
+        the skill declares in `writes`
+
+        result_of picks the skill's result out of dispatch()'s return value.
+        """
+        SKILL_IN_FLIGHT.labels(skill=skill_name).inc()
+        execution_started = time.perf_counter()
+        try:
+            outcome = await dispatch()
+        except BaseException as e:
+            _record(skill_name, execution_started, type(e).__name__)
+            raise
+        finally:
+            SKILL_IN_FLIGHT.labels(skill=skill_name).dec()
+            # Even a failed write may have partially landed
+            if config["writes"]:
+                self.result_cache.invalidate_labels(config["writes"])
+
+        _record(skill_name, execution_started, None if is_success(result_of(outcome)) else "SkillReportedError")
+        return outcome
+
+    async def _dispatch(
+        self,
+        skill_name: str,
+        parameters: Dict[str, Any],
+        config: Dict[str, Any],
+        started: float,
+        timeout: Optional[float],
+        job: bool,
+        wrapper: Optional[Callable] = None,
+        on_start: Optional[Callable[[], None]] = None
+    ) -> Any:
+        skill_timeout = config["job_timeout"] if job else config["timeout"]
+        limits = [t for t in (skill_timeout, timeout) if t]
+        deadline = started + min(limits) if limits else None
+
+        def remaining() -> Optional[float]:
+            return None if deadline is None else max(deadline - time.monotonic(), 0)
+
+        # Process-pool skills are imported in the worker, never in the API process
+        module = await self.load(skill_name) if config["pool"] == "thread" else None
+
+        slot = self._slot(skill_name, config["max_concurrency"])
+        try:
+            await asyncio.wait_for(slot.acquire(), timeout=remaining())
+        except asyncio.TimeoutError:
+            raise SkillTimeoutError(
+                f"Skill '{skill_name}' timed out waiting for a free slot "
+                f"(max_concurrency={config['max_concurrency']})"
+            )
+
+        loop = asyncio.get_running_loop()
+
+        def release(_: Future):
+            self._running[skill_name] -= 1
+            slot.release()
+
+        try:
+            if config["pool"] == "process":
+                future = self._process_pool().submit(
+                    _run_in_process, str(self.module_cache.skills_dir), skill_name, parameters
+                )
+            else:
+                call = (module.execute,) if wrapper is None else (wrapper, module.execute)
+                future = self._threads.submit(*call, **parameters)
+        except Exception:
+            slot.release()
+            raise
+
+        self._running[skill_name] = self._running.get(skill_name, 0) + 1
+        future.add_done_callback(lambda f: _call_soon(loop, release, f))
+        if on_start is not None:
+            on_start()
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=remaining())
+        except asyncio.TimeoutError:
+            # Only queued work can be cancelled; a running thread finishes in the background
+            future.cancel()
+            raise SkillTimeoutError(f"Skill '{skill_name}' exceeded its {min(limits)}s timeout")
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    async def profile(
+        self,
+        skill_name: str,
+        parameters: Dict[str, Any],
+        timeout: Optional[float] = None
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Execute a skill once under the sampling profiler
+
+        Bypasses the result cache and coalescing so the skill really runs, and
+        always uses the thread pool so the profiler can sample it.
+
+        Returns:
+            (result, profile) - profile has a phase breakdown in ms and collapsed stacks
+        """
+        started = time.monotonic()
+        parameters = self.registry.validate(skill_name, parameters)
+        config = dict(skill_config(self.registry.get(skill_name).config), pool="thread")
+
+        load_started = time.perf_counter()
+        await self.load(skill_name)
+        load_ms = round((time.perf_counter() - load_started) * 1000, 3)
+
+        result, profile = await self._tracked(
+            skill_name,
+            config,
+            lambda: self._dispatch(skill_name, parameters, config, started, timeout, job=False, wrapper=profile_call),
+            result_of=lambda outcome: outcome[0]
+        )
+        serialize_ms = measure_serialize(result)
+
+        profile["phases_ms"] = {"load": load_ms, **profile["phases_ms"], "serialize": serialize_ms}
+        profile["total_ms"] = round(load_ms + profile["execute_ms"] + serialize_ms, 3)
+        return result, profile
+
+    def stats(self) -> Dict[str, Any]:
+        """Current in-flight counts per skill"""
+        return {
+            "running": {name: count for name, count in self._running.items() if count},
+            "coalesced_calls": self._single_flight.shared_calls,
+            "coalescing_in_flight": self._single_flight.in_flight(),
+            "result_cache": self.result_cache.stats(),
+            "thread_workers": SKILL_THREAD_WORKERS,
+            "process_workers": SKILL_PROCESS_WORKERS
+        }
+
+    def shutdown(self):
+        """Stop accepting work and cancel anything still queued"""
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+
+
+def _record(skill_name: str, started: float, error: Optional[str]):
+    """Observe one execution in the skill metrics (error is the exception type name, None on success)"""
+    SKILL_DURATION.labels(skill=skill_name, status="error" if error else "success").observe(time.perf_counter() - started)
+    if error:
+        SKILL_ERRORS.labels(skill=skill_name, exception=error).inc()
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback, *args):
+    """Schedule a callback on the event loop from a worker thread (no-op once the loop is gone)"""
+    try:
+        loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        pass
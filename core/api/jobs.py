@@ -0,0 +1,289 @@
+"""
+Willow API - Background Jobs
+Runs long skills as background jobs with progress polling, persisted in SQLite
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from executor import SkillExecutor
+
+JOBS_DB_PATH = Path(os.getenv("JOBS_DB_PATH", "/app/data/jobs.db"))
+JOB_RETENTION_DAYS = float(os.getenv("JOB_RETENTION_DAYS", "7"))
+PROGRESS_FLUSH_SECONDS = 0.5
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed", "cancelled", "interrupted")
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled", "interrupted")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    skill_name TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress_current INTEGER,
+    progress_total INTEGER,
+    progress_message TEXT,
+    result TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status);
+CREATE INDEX IF NOT EXISTS jobs_created_at ON jobs(created_at);
+"""
+
+
+class JobCancelledError(BaseException):
+    """
+    Raised inside a skill's progress callback once its job has been cancelled
+
+    A BaseException so the blanket `except Exception` in most skills doesn't
+    swallow it and report the cancelled job as a success.
+    """
+
+
+class JobStore:
+    """SQLite-backed job table (one connection shared across threads behind a lock)"""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.executescript(SCHEMA)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            self._conn.commit()
+            return cursor
+
+    def create(self, skill_name: str, parameters: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        self._execute(
+            "INSERT INTO jobs (id, skill_name, parameters, status, created_at) VALUES (?, ?, ?, 'queued', ?)",
+            (job_id, skill_name, json.dumps(parameters, default=str), time.time())
+        )
+        return job_id
+
+    def update(self, job_id: str, **fields):
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        self._execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str) -> Optional[dict]:
+        row = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[dict]:
+        if status:
+            rows = self._execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?", (status, limit)
+            ).fetchall()
+        else:
+            rows = self._execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [_row_to_job(row) for row in rows]
+
+    def ids_with_status(self, status: str) -> List[str]:
+        rows = self._execute("SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (status,)).fetchall()
+        return [row["id"] for row in rows]
+
+    def purge_finished(self, older_than: float) -> int:
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        cursor = self._execute(
+            f"DELETE FROM jobs WHERE status IN ({placeholders}) AND finished_at < ?",
+            (*FINISHED_STATUSES, older_than)
+        )
+        return cursor.rowcount
+
+
+def _row_to_job(row: sqlite3.Row) -> dict:
+    job = dict(row)
+    job["parameters"] = json.loads(job["parameters"])
+    job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+    job["cancel_requested"] = bool(job["cancel_requested"])
+    job["progress"] = {
+        "current": job.pop("progress_current"),
+        "total": job.pop("progress_total"),
+        "message": job.pop("progress_message")
+    }
+    return job
+
+
+class ProgressReporter:
+    """
+    Callable handed to skills whose execute() accepts a `progress` argument
+
+    Usage inside a skill:
+        if progress:
+            progress(done, total, "Ingested person 42")
+
+    Writes are throttled so per-row reporting doesn't hammer SQLite. Once the
+    job is cancelled, the next call raises JobCancelledError so the skill stops.
+    """
+
+    def __init__(self, store: JobStore, job_id: str):
+        self.store = store
+        self.job_id = job_id
+        self.cancelled = threading.Event()
+        self._last_flush = 0.0
+
+    def __call__(self, current: int, total: Optional[int] = None, message: Optional[str] = None):
+        if self.cancelled.is_set():
+            raise JobCancelledError(f"Job {self.job_id} was cancelled")
+
+        now = time.monotonic()
+        if now - self._last_flush >= PROGRESS_FLUSH_SECONDS or (total is not None and current >= total):
+            self._last_flush = now
+            self.store.update(
+                self.job_id,
+                progress_current=current,
+                progress_total=total,
+                progress_message=message
+            )
+
+
+class JobManager:
+    """
+    Submits skills as background jobs on the shared SkillExecutor
+
+    Jobs use the skill's `job_timeout` (no limit by default) instead of the
+    interactive `timeout`. Cancelling a queued job stops it outright; a running
+    job is told to stop through its progress callback - skills that don't
+    report progress run to completion in the background and their result is
+    discarded.
+    """
+
+    def __init__(self, store: JobStore, executor: SkillExecutor):
+        self.store = store
+        self.executor = executor
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._reporters: Dict[str, ProgressReporter] = {}
+
+    def recover(self):
+        """
+        Reconcile persisted state after a restart
+
+        Jobs that were running when the API stopped are marked interrupted (they
+        may have partially written, so they're not re-run automatically). Jobs that
+        never started are queued again, unless cancellation was already requested.
+        """
+        self.store.purge_finished(time.time() - JOB_RETENTION_DAYS * 86400)
+
+        for job_id in self.store.ids_with_status("running"):
+            self.store.update(
+                job_id,
+                status="interrupted",
+                error="API restarted while the job was running",
+                finished_at=time.time()
+            )
+
+        for job_id in self.store.ids_with_status("queued"):
+            job = self.store.get(job_id)
+            if job["cancel_requested"]:
+                self.store.update(job_id, status="cancelled", finished_at=time.time())
+                continue
+            self._start(job_id, job["skill_name"], job["parameters"])
+
+    def submit(self, skill_name: str, parameters: Dict[str, Any]) -> dict:
+        """Queue a skill as a job and return the job record immediately"""
+        job_id = self.store.create(skill_name, parameters)
+        self._start(job_id, skill_name, parameters)
+        return self.store.get(job_id)
+
+    def _start(self, job_id: str, skill_name: str, parameters: Dict[str, Any]):
+        task = asyncio.create_task(self._run(job_id, skill_name, parameters))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def _run(self, job_id: str, skill_name: str, parameters: Dict[str, Any]):
+        reporter = ProgressReporter(self.store, job_id)
+        self._reporters[job_id] = reporter
+        started = False
+
+        def mark_running():
+            # Only once the skill holds a concurrency slot - until then the job is still queued
+            nonlocal started
+            started = True
+            self.store.update(job_id, status="running", started_at=time.time())
+
+        try:
+            result = await self.executor.run(
+                skill_name, parameters, job=True, progress=reporter, on_start=mark_running
+            )
+            self.store.update(
+                job_id,
+                status="succeeded",
+                result=json.dumps(result, default=str),
+                finished_at=time.time()
+            )
+
+        except (asyncio.CancelledError, JobCancelledError):
+            if reporter.cancelled.is_set():
+                self.store.update(job_id, status="cancelled", finished_at=time.time())
+            elif not started:
+                pass  # Shut down while waiting for a slot - stays queued for recover()
+            else:
+                # Cancelled by shutdown rather than by a caller
+                self.store.update(
+                    job_id,
+                    status="interrupted",
+                    error="API shut down before the job finished",
+                    finished_at=time.time()
+                )
+
+        except Exception as e:
+            self.store.update(
+                job_id,
+                status="failed",
+                error=f"{type(e).__name__}: {str(e)}",
+                finished_at=time.time()
+            )
+
+        finally:
+            self._reporters.pop(job_id, None)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.store.get(job_id)
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[dict]:
+        return self.store.list(status=status, limit=limit)
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        """Request cancellation. Returns the updated job, or None if it doesn't exist."""
+        job = self.store.get(job_id)
+        if job is None or job["status"] in FINISHED_STATUSES:
+            return job
+
+        if job["status"] == "queued":
+            # Its task may never get to run (or never reach a slot), so settle it here
+            self.store.update(job_id, cancel_requested=1, status="cancelled", finished_at=time.time())
+        else:
+            self.store.update(job_id, cancel_requested=1)
+
+        reporter = self._reporters.get(job_id)
+        if reporter is not None:
+            reporter.cancelled.set()
+
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+
+        return self.store.get(job_id)
+
+    def shutdown(self):
+        """Interrupt jobs still in flight (anything not recorded in time is reconciled by recover())"""
+        for task in list(self._tasks.values()):
+            task.cancel()
+
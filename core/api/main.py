@@ -5,54 +5,65 @@ Skill execution environment for Python-based skills
 
 import os
 import sys
-import importlib.util
-from typing import Any, Dict, Optional
+import json
+import time
+import asyncio
+from typing import Any, Dict, List, Optional
 from pathlib import Path
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import FileResponse, PlainTextResponse, Response, StreamingResponse
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
 from pydantic import BaseModel
 import uvicorn
 
+from executor import SkillExecutor
+import metrics
+from jobs import JOB_STATUSES, JOBS_DB_PATH, JobManager, JobStore
+from module_cache import ModuleCache
+from profiling import list_profiles, profile_path, save_profile
+from pipelines import PipelineError, PipelineRequest, run_pipeline
+from skill_registry import SkillParameterError, SkillRegistry
+
 # Add skills directory to Python path
 SKILLS_DIR = Path("/app/skills")
 sys.path.insert(0, str(SKILLS_DIR))
 
+# Largest number of skill calls accepted by /execute/batch
+BATCH_MAX_ITEMS = int(os.getenv("SKILL_BATCH_MAX_ITEMS", "100"))
+
 # Initialize FastAPI app
 app = FastAPI(title="Willow API", version="0.1.0")
 
+# Skill signatures, docs and config indexed from source, kept current by a file watcher
+registry = SkillRegistry(SKILLS_DIR)
+
+# Loaded skill modules, reused across requests until the file changes
+module_cache = ModuleCache(SKILLS_DIR)
+
+# Bounded thread/process pools with per-skill concurrency caps and timeouts
+executor = SkillExecutor(module_cache, registry)
+
+# Long-running skills as background jobs, persisted across restarts
+job_manager = JobManager(JobStore(JOBS_DB_PATH), executor)
+
 # Request/Response models
 class SkillExecutionRequest(BaseModel):
     skill_name: str
     parameters: Optional[Dict[str, Any]] = {}
+    timeout: Optional[float] = None
+    profile: bool = False
+    save_profile: bool = False
+
+class CacheInvalidationRequest(BaseModel):
+    labels: List[str] = []
+    skill_name: Optional[str] = None
 
 class SkillExecutionResponse(BaseModel):
     success: bool
     result: Optional[Any] = None
     error: Optional[str] = None
     skill_name: str
-
-def load_skill(skill_name: str):
-    """
-    Dynamically load a Python skill module
-
-    Args:
-        skill_name: Name of the skill (e.g., 'hello_world')
-
-    Returns:
-        Loaded module
-    """
-    skill_path = SKILLS_DIR / f"{skill_name}.py"
-
-    if not skill_path.exists():
-        raise FileNotFoundError(f"Skill '{skill_name}' not found at {skill_path}")
-
-    spec = importlib.util.spec_from_file_location(skill_name, skill_path)
-    if spec is None or spec.loader is None:
-        raise ImportError(f"Could not load skill '{skill_name}'")
-
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-
-    return module
+    profile: Optional[Dict[str, Any]] = None
 
 @app.get("/")
 def root():
@@ -71,38 +82,51 @@ def list_skills():
     """
     List all available Python skills
     """
-    if not SKILLS_DIR.exists():
-        return {"skills": []}
+    return {"skills": registry.names()}
 
-    skills = []
-    for skill_file in SKILLS_DIR.glob("*.py"):
-        if skill_file.name.startswith("__"):
-            continue
-        skills.append(skill_file.stem)
-
-    return {"skills": sorted(skills)}
+@app.get("/skills/{skill_name}")
+def describe_skill(skill_name: str):
+    """
+    Describe a skill: docstring, parameters, JSON schema and execution config
+    """
+    info = registry.get(skill_name)
+    if info is None:
+        raise HTTPException(status_code=404, detail=f"Skill '{skill_name}' not found")
+    return info.describe()
 
 @app.post("/execute", response_model=SkillExecutionResponse)
-def execute_skill(request: SkillExecutionRequest):
+async def execute_skill(request: SkillExecutionRequest, profile: bool = False):
     """
     Execute a Python skill by name
 
+    With `profile` (in the body or as ?profile=true) the skill runs once under
+    the sampling profiler, bypassing the result cache, and the response carries
+    a phase breakdown (load, connect, query, http, skill, serialize) and
+    collapsed stacks. `save_profile` also writes it under PROFILE_DIR.
+
     Args:
-        request: SkillExecutionRequest with skill_name and parameters
+        request: SkillExecutionRequest with skill_name, parameters and optional timeout
 
     Returns:
         SkillExecutionResponse with result or error
     """
     try:
-        # Load the skill module
-        skill_module = load_skill(request.skill_name)
+        if request.profile or profile:
+            result, skill_profile = await executor.profile(
+                request.skill_name, request.parameters or {}, timeout=request.timeout
+            )
+            if request.save_profile:
+                skill_profile["saved_to"] = save_profile(request.skill_name, skill_profile)
 
-        # Check if execute function exists
-        if not hasattr(skill_module, 'execute'):
-            raise AttributeError(f"Skill '{request.skill_name}' does not have an 'execute' function")
+            return SkillExecutionResponse(
+                success=True,
+                result=result,
+                skill_name=request.skill_name,
+                profile=skill_profile
+            )
 
-        # Execute the skill
-        result = skill_module.execute(**request.parameters)
+        # Runs in the skill's pool, subject to its concurrency cap and timeout
+        result = await executor.run(request.skill_name, request.parameters or {}, timeout=request.timeout)
 
         return SkillExecutionResponse(
             success=True,
@@ -124,8 +148,84 @@ def execute_skill(request: SkillExecutionRequest):
             skill_name=request.skill_name
         )
 
+@app.post("/execute/batch")
+async def execute_batch(requests: List[SkillExecutionRequest]):
+    """
+    Execute many skills concurrently in one round trip
+
+    Each item still goes through its skill's concurrency cap and timeout.
+    Results are streamed back as NDJSON in completion order - one line per
+    item carrying its position in the request (`index`) and `duration_ms` -
+    followed by a final summary line with `"done": true`.
+
+    Args:
+        requests: List of SkillExecutionRequest
+
+    Returns:
+        application/x-ndjson stream of per-item results
+    """
+    if len(requests) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(requests)} exceeds the limit of {BATCH_MAX_ITEMS} items"
+        )
+
+    batch_started = time.perf_counter()
+
+    async def run_item(index: int, request: SkillExecutionRequest) -> dict:
+        started = time.perf_counter()
+        response = await execute_skill(request)
+        item = response.model_dump()
+        item["index"] = index
+        item["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return item
+
+    async def stream():
+        tasks = [asyncio.create_task(run_item(i, r)) for i, r in enumerate(requests)]
+        succeeded = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                succeeded += item["success"]
+                yield json.dumps(item, default=str) + "\n"
+        finally:
+            # Client went away mid-stream - don't leave work queued behind it
+            for task in tasks:
+                task.cancel()
+
+        yield json.dumps({
+            "done": True,
+            "count": len(requests),
+            "succeeded": succeeded,
+            "failed": len(requests) - succeeded,
+            "duration_ms": round((time.perf_counter() - batch_started) * 1000, 3)
+        }) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.post("/execute/pipeline")
+async def execute_pipeline(request: PipelineRequest):
+    """
+    Run a DAG of skill calls server-side in one round trip
+
+    Steps feed later steps through `${step_id.path}` references in their
+    parameters (e.g. "${search.results.0.title}"); independent branches run
+    in parallel. Only the `outputs` steps' results are returned (default: the
+    final steps), plus a per-step status report.
+
+    Args:
+        request: PipelineRequest with steps and optional outputs
+
+    Returns:
+        dict with success, outputs, per-step report and duration_ms
+    """
+    try:
+        return await run_pipeline(request, executor)
+    except PipelineError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.post("/execute/{skill_name}")
-def execute_skill_by_path(skill_name: str, parameters: Optional[Dict[str, Any]] = None):
+async def execute_skill_by_path(skill_name: str, parameters: Optional[Dict[str, Any]] = None):
     """
     Execute a skill via path parameter (alternative endpoint)
 
@@ -140,7 +240,184 @@ def execute_skill_by_path(skill_name: str, parameters: Optional[Dict[str, Any]]
         skill_name=skill_name,
         parameters=parameters or {}
     )
-    return execute_skill(request)
+    return await execute_skill(request)
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: SkillExecutionRequest):
+    """
+    Submit a skill as a background job
+
+    Returns immediately with the job record; poll GET /jobs/{job_id} for
+    status, progress and result. Skills whose execute() takes a `progress`
+    argument get a callback for reporting progress counters.
+    """
+    try:
+        parameters = registry.validate(request.skill_name, request.parameters or {})
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (SkillParameterError, AttributeError, SyntaxError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return job_manager.submit(request.skill_name, parameters)
+
+@app.get("/jobs")
+def list_jobs(status: Optional[str] = None, limit: int = 50):
+    """
+    List recent jobs, newest first, optionally filtered by status
+    """
+    if status and status not in JOB_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Unknown status '{status}' (expected one of {', '.join(JOB_STATUSES)})")
+    jobs = job_manager.list(status=status, limit=limit)
+    return {"jobs": jobs, "count": len(jobs)}
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """
+    Get a job's status, progress counters and (once finished) result or error
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job
+
+@app.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """
+    Cancel a queued or running job
+    """
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job
+
+@app.post("/cache/invalidate")
+def invalidate_cache(request: CacheInvalidationRequest):
+    """
+    Drop cached skill results after a graph write made outside the API
+
+    Args:
+        request: labels that were written ("*" for everything) and/or a skill_name to flush
+
+    Returns:
+        Number of cached results dropped
+    """
+    dropped = 0
+    if request.labels:
+        dropped += executor.result_cache.invalidate_labels(request.labels)
+    if request.skill_name:
+        dropped += executor.result_cache.invalidate_skill(request.skill_name)
+    return {"invalidated": dropped}
+
+@app.get("/admin/cache")
+def result_cache_stats():
+    """
+    Show result cache size and hit ratio
+    """
+    return executor.result_cache.stats()
+
+@app.delete("/admin/cache")
+def clear_result_cache():
+    """
+    Drop every cached skill result
+    """
+    return {"invalidated": executor.result_cache.clear()}
+
+@app.get("/admin/modules")
+def list_cached_modules():
+    """
+    List skill modules currently held in the module cache
+    """
+    modules = module_cache.entries()
+    return {"modules": modules, "count": len(modules)}
+
+@app.delete("/admin/modules")
+def evict_all_modules():
+    """
+    Evict every cached skill module (next /execute re-imports)
+    """
+    return {"evicted": module_cache.clear()}
+
+@app.delete("/admin/modules/{skill_name}")
+def evict_module(skill_name: str):
+    """
+    Evict a single skill module from the cache
+    """
+    if not module_cache.evict(skill_name):
+        raise HTTPException(status_code=404, detail=f"Skill '{skill_name}' is not cached")
+    return {"evicted": skill_name}
+
+@app.get("/admin/profiles")
+def saved_profiles():
+    """
+    List profiles saved with save_profile, newest first
+    """
+    profiles = list_profiles()
+    return {"profiles": profiles, "count": len(profiles)}
+
+@app.get("/admin/profiles/{name}")
+def download_profile(name: str, format: str = "collapsed"):
+    """
+    Download a saved profile as collapsed stacks (flamegraph.pl / speedscope) or its JSON summary
+    """
+    if format not in ("collapsed", "json"):
+        raise HTTPException(status_code=400, detail="format must be 'collapsed' or 'json'")
+    path = profile_path(name, f".{format}")
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile '{name}' not found")
+    return FileResponse(path, media_type="text/plain" if format == "collapsed" else "application/json")
+
+@app.get("/admin/executor")
+def executor_stats():
+    """
+    Show in-flight executions per skill and pool sizes
+    """
+    return executor.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """
+    Prometheus scrape endpoint
+
+    Per-skill execution time histograms, error counts by exception type,
+    in-flight gauges, result cache hits/misses and module load times.
+    """
+    # Passed as a header - as media_type Starlette would append a second charset
+    return Response(metrics.render(), headers={"Content-Type": metrics.CONTENT_TYPE})
+
+def collect_state_metrics():
+    """Gauges and counters read from the executor and module cache on each scrape"""
+    running = GaugeMetricFamily("willow_skill_running", "Skill calls occupying a pool worker", labels=["skill"])
+    for skill_name, count in executor.stats()["running"].items():
+        running.add_metric([skill_name], count)
+
+    cache = executor.result_cache.stats()
+    hit_ratio = GaugeMetricFamily(
+        "willow_result_cache_hit_ratio", "Result cache hits / lookups since startup", value=cache["hit_ratio"] or 0
+    )
+    cache_entries = GaugeMetricFamily("willow_result_cache_entries", "Results currently cached", value=cache["entries"])
+
+    module_hits = CounterMetricFamily(
+        "willow_module_cache_hits_total", "Calls served by an already-loaded skill module", labels=["skill"]
+    )
+    for entry in module_cache.entries():
+        module_hits.add_metric([entry["skill_name"]], entry["hits"])
+
+    return [running, hit_ratio, cache_entries, module_hits]
+
+metrics.register_collector(collect_state_metrics)
+
+@app.on_event("startup")
+async def startup_event():
+    """Index skills, resume queued jobs and mark jobs interrupted by the last shutdown"""
+    registry.start_watching()
+    job_manager.recover()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """Stop background jobs and the skill pools on shutdown"""
+    registry.stop()
+    job_manager.shutdown()
+    executor.shutdown()
 
 if __name__ == "__main__":
     print("Starting Willow API on port 8000")
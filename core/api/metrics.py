@@ -0,0 +1,76 @@
+"""
+Willow API - Metrics
+Prometheus counters, gauges and histograms for skill executions
+"""
+
+import os
+from typing import Callable, Iterable
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.metrics_core import Metric
+
+# Seconds - spans quick read-only skills up to the 600s ingest skills
+DEFAULT_BUCKETS = tuple(
+    float(bound) for bound in os.getenv(
+        "SKILL_METRICS_BUCKETS",
+        "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10,30,60,120,300,600"
+    ).split(",")
+)
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Recorded by the executor / module cache as work happens
+SKILL_DURATION = Histogram(
+    "willow_skill_execution_seconds",
+    "Wall time of skill executions (excludes result cache hits)",
+    ["skill", "status"],
+    buckets=DEFAULT_BUCKETS
+)
+SKILL_ERRORS = Counter(
+    "willow_skill_errors_total",
+    "Failed skill executions by exception type (SkillReportedError for in-band failures)",
+    ["skill", "exception"]
+)
+SKILL_IN_FLIGHT = Gauge(
+    "willow_skill_in_flight",
+    "Skill executions currently running or waiting for a concurrency slot (coalesced calls count once)",
+    ["skill"]
+)
+RESULT_CACHE_LOOKUPS = Counter(
+    "willow_result_cache_lookups_total",
+    "Result cache lookups for cacheable skills",
+    ["skill", "result"]
+)
+COALESCED_CALLS = Counter(
+    "willow_skill_coalesced_calls_total",
+    "Calls that joined an identical call already in flight",
+    ["skill"]
+)
+MODULE_LOAD = Histogram(
+    "willow_skill_module_load_seconds",
+    "Time to import a skill module (cache misses and reloads only)",
+    ["skill"],
+    buckets=DEFAULT_BUCKETS
+)
+
+
+class _StateCollector:
+    def __init__(self, collect: Callable[[], Iterable[Metric]]):
+        self._collect = collect
+
+    def collect(self) -> Iterable[Metric]:
+        return self._collect()
+
+    def describe(self) -> Iterable[Metric]:
+        # Nothing to check up front - collect() may need state that doesn't exist yet
+        return []
+
+
+def register_collector(collect: Callable[[], Iterable[Metric]]):
+    """Add metrics read from current state on every scrape (collect returns GaugeMetricFamily etc.)"""
+    REGISTRY.register(_StateCollector(collect))
+
+
+def render() -> bytes:
+    """Every registered metric in Prometheus text format"""
+    return generate_latest(REGISTRY)
@@ -0,0 +1,147 @@
+"""
+Willow API - Skill Module Cache
+Keeps loaded skill modules in memory so /execute doesn't re-import them on every call
+"""
+
+import hashlib
+import importlib.util
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List
+
+from metrics import MODULE_LOAD
+
+
+@dataclass
+class CachedModule:
+    """A loaded skill module plus the file state it was loaded from"""
+    name: str
+    path: Path
+    module: ModuleType
+    mtime: float
+    size: int
+    content_hash: str
+    loaded_at: float
+    load_seconds: float
+    hits: int = 0
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's contents"""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class ModuleCache:
+    """
+    In-memory registry of loaded skill modules
+
+    An entry is reused as long as the file's mtime and size are unchanged.
+    If the mtime moves, the file is re-hashed and only re-imported when the
+    content actually changed (so a `touch` or a git checkout of identical
+    content keeps the warm module).
+    """
+
+    def __init__(self, skills_dir: Path):
+        self.skills_dir = skills_dir
+        self._entries: Dict[str, CachedModule] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, skill_name: str) -> ModuleType:
+        """
+        Return the loaded module for a skill, importing it if needed
+
+        Args:
+            skill_name: Name of the skill (e.g., 'hello_world')
+
+        Returns:
+            Loaded module
+        """
+        skill_path = self.skills_dir / f"{skill_name}.py"
+
+        if not skill_path.exists():
+            self.evict(skill_name)
+            raise FileNotFoundError(f"Skill '{skill_name}' not found at {skill_path}")
+
+        stat = skill_path.stat()
+
+        # Serialise loads per skill so one slow import doesn't block cache hits
+        # for every other skill
+        with self._lock:
+            skill_lock = self._load_locks.setdefault(skill_name, threading.Lock())
+
+        with skill_lock:
+            with self._lock:
+                entry = self._entries.get(skill_name)
+                if entry is not None and entry.mtime == stat.st_mtime and entry.size == stat.st_size:
+                    entry.hits += 1
+                    return entry.module
+
+            content_hash = hash_file(skill_path)
+
+            with self._lock:
+                if entry is not None and entry.content_hash == content_hash:
+                    entry.mtime = stat.st_mtime
+                    entry.size = stat.st_size
+                    entry.hits += 1
+                    return entry.module
+
+            entry = self._load(skill_name, skill_path, stat, content_hash)
+
+            with self._lock:
+                self._entries[skill_name] = entry
+            return entry.module
+
+    def _load(self, skill_name: str, skill_path: Path, stat, content_hash: str) -> CachedModule:
+        started = time.perf_counter()
+
+        spec = importlib.util.spec_from_file_location(skill_name, skill_path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Could not load skill '{skill_name}'")
+
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        load_seconds = time.perf_counter() - started
+        MODULE_LOAD.labels(skill=skill_name).observe(load_seconds)
+
+        return CachedModule(
+            name=skill_name,
+            path=skill_path,
+            module=module,
+            mtime=stat.st_mtime,
+            size=stat.st_size,
+            content_hash=content_hash,
+            loaded_at=time.time(),
+            load_seconds=load_seconds
+        )
+
+    def entries(self) -> List[dict]:
+        """Describe every cached module (for the admin endpoint)"""
+        with self._lock:
+            return [
+                {
+                    "skill_name": entry.name,
+                    "path": str(entry.path),
+                    "content_hash": entry.content_hash,
+                    "mtime": entry.mtime,
+                    "loaded_at": entry.loaded_at,
+                    "load_ms": round(entry.load_seconds * 1000, 3),
+                    "hits": entry.hits
+                }
+                for entry in sorted(self._entries.values(), key=lambda e: e.name)
+            ]
+
+    def evict(self, skill_name: str) -> bool:
+        """Drop one skill from the cache. Returns True if it was cached."""
+        with self._lock:
+            return self._entries.pop(skill_name, None) is not None
+
+    def clear(self) -> int:
+        """Drop every cached module. Returns how many were evicted."""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
@@ -0,0 +1,190 @@
+"""
+Willow API - Skill Pipelines
+Runs a small DAG of skill calls server-side, feeding step outputs into later steps
+"""
+
+import asyncio
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from executor import SkillExecutor
+from result_cache import is_success
+
+PIPELINE_MAX_STEPS = int(os.getenv("PIPELINE_MAX_STEPS", "20"))
+
+# ${step_id.path.to.value} - list indexes are plain numbers, e.g. ${search.results.0.title}
+REFERENCE = re.compile(r"\$\{([A-Za-z0-9_\-]+)((?:\.[^.}]+)*)\}")
+
+
+class PipelineStep(BaseModel):
+    id: str
+    skill_name: str
+    parameters: Optional[Dict[str, Any]] = {}
+    depends_on: List[str] = []
+    timeout: Optional[float] = None
+
+
+class PipelineRequest(BaseModel):
+    steps: List[PipelineStep]
+    outputs: Optional[List[str]] = None  # step ids to return (default: steps nothing depends on)
+
+
+class PipelineError(ValueError):
+    """Raised when a pipeline definition is invalid (unknown step, cycle, bad reference)"""
+
+
+def _references(value: Any) -> Set[str]:
+    """Step ids referenced anywhere inside a parameter value"""
+    if isinstance(value, str):
+        return {match.group(1) for match in REFERENCE.finditer(value)}
+    if isinstance(value, dict):
+        return set().union(*(_references(v) for v in value.values())) if value else set()
+    if isinstance(value, list):
+        return set().union(*(_references(v) for v in value)) if value else set()
+    return set()
+
+
+def _lookup(results: Dict[str, Any], step_id: str, path: str) -> Any:
+    value = results[step_id]
+    for part in filter(None, path.split(".")):
+        try:
+            value = value[int(part)] if isinstance(value, list) else value[part]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise PipelineError(f"Reference ${{{step_id}{path}}} not found in the output of step '{step_id}'")
+    return value
+
+
+def _resolve(value: Any, results: Dict[str, Any]) -> Any:
+    """
+    Substitute ${step.path} references with earlier step outputs
+
+    A string that is exactly one reference takes the referenced value as-is
+    (lists, dicts, numbers); references inside longer strings are interpolated.
+    """
+    if isinstance(value, str):
+        match = REFERENCE.fullmatch(value)
+        if match:
+            return _lookup(results, match.group(1), match.group(2))
+        return REFERENCE.sub(lambda m: str(_lookup(results, m.group(1), m.group(2))), value)
+    if isinstance(value, dict):
+        return {key: _resolve(v, results) for key, v in value.items()}
+    if isinstance(value, list):
+        return [_resolve(v, results) for v in value]
+    return value
+
+
+def plan(request: PipelineRequest) -> Tuple[Dict[str, Set[str]], List[str]]:
+    """
+    Validate a pipeline and work out each step's dependencies
+
+    Returns:
+        (step id -> ids of steps it depends on (explicit depends_on plus references),
+         step ids in dependency order)
+    """
+    if not request.steps:
+        raise PipelineError("Pipeline has no steps")
+    if len(request.steps) > PIPELINE_MAX_STEPS:
+        raise PipelineError(f"Pipeline of {len(request.steps)} steps exceeds the limit of {PIPELINE_MAX_STEPS}")
+
+    ids = [step.id for step in request.steps]
+    duplicates = {step_id for step_id in ids if ids.count(step_id) > 1}
+    if duplicates:
+        raise PipelineError(f"Duplicate step ids: {', '.join(sorted(duplicates))}")
+
+    dependencies = {
+        step.id: set(step.depends_on) | _references(step.parameters or {})
+        for step in request.steps
+    }
+    for step_id, needs in dependencies.items():
+        unknown = needs - set(ids)
+        if unknown:
+            raise PipelineError(f"Step '{step_id}' depends on unknown steps: {', '.join(sorted(unknown))}")
+
+    for output in request.outputs or []:
+        if output not in dependencies:
+            raise PipelineError(f"Unknown output step '{output}'")
+
+    # Kahn's algorithm - anything left over is on a cycle
+    remaining = {step_id: set(needs) for step_id, needs in dependencies.items()}
+    order: List[str] = []
+    while True:
+        ready = [step_id for step_id, needs in remaining.items() if not needs]
+        if not ready:
+            break
+        order.extend(ready)
+        for step_id in ready:
+            del remaining[step_id]
+        for needs in remaining.values():
+            needs.difference_update(ready)
+    if remaining:
+        raise PipelineError(f"Pipeline has a cycle between: {', '.join(sorted(remaining))}")
+
+    return dependencies, order
+
+
+async def run_pipeline(request: PipelineRequest, executor: SkillExecutor) -> dict:
+    """
+    Run every step as soon as its dependencies finish, so independent branches run in parallel
+
+    A step whose skill raises or returns {"success": False} fails, and every step
+    downstream of it is skipped. Other branches carry on.
+    """
+    dependencies, order = plan(request)
+    started = time.perf_counter()
+    steps = {step.id: step for step in request.steps}
+    results: Dict[str, Any] = {}
+    report: Dict[str, dict] = {}
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run_step(step: PipelineStep) -> bool:
+        upstream = await asyncio.gather(*(tasks[dep] for dep in dependencies[step.id]))
+        failed = [dep for dep, ok in zip(dependencies[step.id], upstream) if not ok]
+        if failed:
+            report[step.id] = {
+                "skill_name": step.skill_name,
+                "status": "skipped",
+                "error": f"Upstream step failed: {', '.join(sorted(failed))}"
+            }
+            return False
+
+        step_started = time.perf_counter()
+        try:
+            parameters = _resolve(step.parameters or {}, results)
+            result = await executor.run(step.skill_name, parameters, timeout=step.timeout)
+            ok, error = is_success(result), None
+        except Exception as e:
+            result, ok, error = None, False, f"{type(e).__name__}: {str(e)}"
+
+        results[step.id] = result
+        report[step.id] = {
+            "skill_name": step.skill_name,
+            "status": "succeeded" if ok else "failed",
+            "error": error,
+            "duration_ms": round((time.perf_counter() - step_started) * 1000, 3)
+        }
+        return ok
+
+    # Dependency order, so every step's upstream tasks exist when it is scheduled
+    for step_id in order:
+        tasks[step_id] = asyncio.create_task(run_step(steps[step_id]))
+
+    try:
+        await asyncio.gather(*tasks.values())
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+    depended_on = set().union(*dependencies.values())
+    outputs = request.outputs or [step.id for step in request.steps if step.id not in depended_on]
+
+    return {
+        "success": all(entry["status"] == "succeeded" for entry in report.values()),
+        "outputs": {step_id: results.get(step_id) for step_id in outputs},
+        "steps": {step.id: report[step.id] for step in request.steps},
+        "duration_ms": round((time.perf_counter() - started) * 1000, 3)
+    }
+
@@ -0,0 +1,179 @@
+"""
+Willow API - Skill Profiling
+Sampling profiler for single skill executions: collapsed stacks plus a phase breakdown
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", "/app/data/profiles"))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+
+# Neo4j driver frames that are about getting a connection rather than running a query
+_CONNECT_FUNCTIONS = re.compile(r"driver|connect|acquire|open|handshake|routing|verify|ssl", re.IGNORECASE)
+_HTTP_MODULES = ("requests", "urllib3", "http.client", "socket")
+
+
+def _module(frame) -> str:
+    return frame.f_globals.get("__name__", "?")
+
+
+def classify(stack: List[Any]) -> str:
+    """
+    Attribute one sample to a phase
+
+    load    - imports triggered while the skill runs
+    connect - neo4j driver creation / connection acquisition
+    query   - anything else inside the neo4j driver
+    http    - requests/urllib3 (Ollama embeddings and other HTTP calls)
+    skill   - the skill's own Python code
+    """
+    if any(frame.f_code.co_filename.startswith("<frozen importlib") for frame in stack):
+        return "load"
+    neo4j_frames = [frame for frame in stack if _module(frame).startswith("neo4j")]
+    if neo4j_frames:
+        if any(_CONNECT_FUNCTIONS.search(frame.f_code.co_name) for frame in neo4j_frames):
+            return "connect"
+        return "query"
+    if any(_module(frame).startswith(_HTTP_MODULES) for frame in stack):
+        return "http"
+    return "skill"
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack every `interval` seconds"""
+
+    def __init__(self, target_ident: int, interval: float, root_code):
+        super().__init__(name="skill-profiler", daemon=True)
+        self.target_ident = target_ident
+        self.interval = interval
+        self.root_code = root_code
+        self.stacks: Counter = Counter()
+        self.phases: Counter = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_ident)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                if frame.f_code is self.root_code:
+                    break  # drop the pool worker / profiler frames underneath the skill
+                stack.append(frame)
+                frame = frame.f_back
+            stack.reverse()
+            if not stack:
+                continue
+
+            self.samples += 1
+            self.stacks[";".join(f"{_module(f)}:{f.f_code.co_name}" for f in stack)] += 1
+            self.phases[classify(stack)] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def profile_call(execute: Callable, **parameters) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Run execute(**parameters) in the current thread under the sampling profiler
+
+    Returns:
+        (result, profile data) - phases are in ms, scaled from sample counts to measured wall time
+    """
+    sampler = StackSampler(threading.get_ident(), PROFILE_SAMPLE_INTERVAL_MS / 1000, profile_call.__code__)
+    sampler.start()
+    started = time.perf_counter()
+    try:
+        result = execute(**parameters)
+    finally:
+        wall = time.perf_counter() - started
+        sampler.stop()
+
+    wall_ms = wall * 1000
+    phases = {
+        phase: round(wall_ms * count / sampler.samples, 3)
+        for phase, count in sampler.phases.most_common()
+    } if sampler.samples else {"skill": round(wall_ms, 3)}
+
+    self_samples: Counter = Counter()
+    for stack, count in sampler.stacks.items():
+        self_samples[stack.rsplit(";", 1)[-1]] += count
+
+    return result, {
+        "execute_ms": round(wall_ms, 3),
+        "samples": sampler.samples,
+        "interval_ms": PROFILE_SAMPLE_INTERVAL_MS,
+        "phases_ms": phases,
+        "top_functions": [
+            {"frame": frame, "self_samples": count} for frame, count in self_samples.most_common(15)
+        ],
+        "collapsed": "\n".join(f"{stack} {count}" for stack, count in sampler.stacks.most_common())
+    }
+
+
+def measure_serialize(result: Any) -> float:
+    """Time (ms) to JSON-encode a skill result the way it goes back over the wire"""
+    started = time.perf_counter()
+    json.dumps(result, default=str)
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def save_profile(skill_name: str, profile: Dict[str, Any]) -> str:
+    """
+    Write a profile to PROFILE_DIR for later comparison
+
+    Writes <skill>-<timestamp>.collapsed (feed to flamegraph.pl / speedscope) and a
+    matching .json with the phase breakdown. Returns the .collapsed path.
+    """
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    stem = f"{skill_name}-{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}"
+
+    collapsed_path = PROFILE_DIR / f"{stem}.collapsed"
+    collapsed_path.write_text(profile["collapsed"] + "\n")
+
+    summary = {key: value for key, value in profile.items() if key != "collapsed"}
+    (PROFILE_DIR / f"{stem}.json").write_text(json.dumps({"skill_name": skill_name, **summary}, indent=2))
+
+    return str(collapsed_path)
+
+
+def list_profiles() -> List[dict]:
+    """Saved profiles, newest first"""
+    if not PROFILE_DIR.exists():
+        return []
+
+    profiles = []
+    for path in sorted(PROFILE_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True):
+        try:
+            summary = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        profiles.append({
+            "name": path.stem,
+            "skill_name": summary.get("skill_name"),
+            "total_ms": summary.get("total_ms"),
+            "phases_ms": summary.get("phases_ms"),
+            "collapsed_path": str(path.with_suffix(".collapsed"))
+        })
+    return profiles
+
+
+def profile_path(name: str, suffix: str) -> Optional[Path]:
+    """Resolve a saved profile file by name, refusing anything outside PROFILE_DIR"""
+    path = (PROFILE_DIR / f"{name}{suffix}").resolve()
+    if path.parent != PROFILE_DIR.resolve() or not path.exists():
+        return None
+    return path
@@ -0,0 +1,126 @@
+"""
+Willow API - Skill Result Cache
+TTL + LRU cache for read-only skill results, invalidated by graph label when write skills run
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, FrozenSet, Iterable, Tuple
+
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("SKILL_RESULT_CACHE_MAX_ENTRIES", "1024"))
+
+# A write skill declaring this label invalidates every cached result
+ALL_LABELS = "*"
+
+
+@dataclass
+class _Entry:
+    skill_name: str
+    value: Any
+    expires_at: float
+    labels: FrozenSet[str]
+
+
+def is_success(result: Any) -> bool:
+    """Skills report failures in-band ({"success": False} or {"error": ...}) - those are never cached"""
+    if isinstance(result, dict):
+        return result.get("success", True) is not False and "error" not in result
+    return True
+
+
+class ResultCache:
+    """
+    Results of read-only skills keyed by skill name and normalized parameters
+
+    Skills opt in through SKILL_CONFIG:
+        "cache_ttl": seconds a result stays fresh
+        "reads": graph labels the result depends on
+    and write skills declare "writes" - the labels they touch. When a write
+    skill runs, every cached result that reads one of those labels is dropped.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Bumped on every invalidation so a read that started before a write
+        # can't store its (possibly stale) result after the write landed
+        self.generation = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Returns (hit, value)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry.value
+
+    def put(self, key: str, skill_name: str, value: Any, ttl: float, labels: Iterable[str], generation: int):
+        """Store a result computed while the cache was at `generation` (skipped if a write happened since)"""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = _Entry(
+                skill_name=skill_name,
+                value=value,
+                expires_at=time.monotonic() + ttl,
+                labels=frozenset(labels)
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_labels(self, labels: Iterable[str]) -> int:
+        """Drop every result that reads one of these labels. Returns how many were dropped."""
+        labels = set(labels)
+        with self._lock:
+            if ALL_LABELS in labels:
+                stale = list(self._entries)
+            else:
+                stale = [key for key, entry in self._entries.items() if entry.labels & labels]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            self.generation += 1
+            return len(stale)
+
+    def invalidate_skill(self, skill_name: str) -> int:
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.skill_name == skill_name]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            self.generation += 1
+            return len(stale)
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self.invalidations += count
+            self.generation += 1
+            return count
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "invalidations": self.invalidations
+            }
@@ -0,0 +1,335 @@
+"""
+Willow API - Skill Registry
+Indexes skill files once at startup (without importing them) and keeps the index current
+"""
+
+import ast
+import hashlib
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+from pydantic import BaseModel, ConfigDict, ValidationError, create_model
+
+SKILL_WATCH_INTERVAL = float(os.getenv("SKILL_WATCH_INTERVAL", "2"))
+
+# Arguments the runtime supplies itself (e.g. job progress callbacks) - never accepted from callers
+RUNTIME_PARAMETERS = {"progress"}
+
+_TYPE_NAMES = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "dict": dict,
+    "Dict": dict,
+    "list": list,
+    "List": list,
+    "Any": Any,
+}
+
+
+class SkillParameterError(ValueError):
+    """Raised when /execute parameters don't match the skill's execute() signature"""
+
+
+@dataclass
+class SkillInfo:
+    """Everything the API knows about a skill file without importing it"""
+    name: str
+    path: Path
+    content_hash: str
+    mtime: float
+    size: int
+    description: Optional[str] = None
+    docstring: Optional[str] = None
+    parameters: List[dict] = field(default_factory=list)
+    has_execute: bool = False
+    accepts_progress: bool = False
+    config: Dict[str, Any] = field(default_factory=dict)
+    parameter_model: Optional[Type[BaseModel]] = None
+    parse_error: Optional[str] = None
+
+    def describe(self) -> dict:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "docstring": self.docstring,
+            "parameters": self.parameters,
+            "has_execute": self.has_execute,
+            "config": self.config,
+            "content_hash": self.content_hash,
+            "parse_error": self.parse_error,
+            "schema": self.parameter_model.model_json_schema() if self.parameter_model else None
+        }
+
+
+def _base_name(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):  # typing.Optional
+        return node.attr
+    return None
+
+
+def _annotation_type(node: Optional[ast.AST]) -> Any:
+    """Map a source annotation onto a Python type pydantic can validate (Any when unsure)"""
+    if node is None:
+        return Any
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        try:
+            return _annotation_type(ast.parse(node.value, mode="eval").body)
+        except SyntaxError:
+            return Any
+
+    if isinstance(node, ast.Constant) and node.value is None:
+        return type(None)
+
+    if isinstance(node, (ast.Name, ast.Attribute)):
+        return _TYPE_NAMES.get(_base_name(node), Any)
+
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):  # X | None
+        return Union[_annotation_type(node.left), _annotation_type(node.right)]
+
+    if isinstance(node, ast.Subscript):
+        base = _base_name(node.value)
+        args = node.slice.elts if isinstance(node.slice, ast.Tuple) else [node.slice]
+
+        if base == "Optional":
+            return Optional[_annotation_type(args[0])]
+        if base == "Union":
+            return Union[tuple(_annotation_type(arg) for arg in args)]
+        if base in ("List", "list"):
+            return List[_annotation_type(args[0])]
+        if base in ("Dict", "dict"):
+            return dict
+
+    return Any
+
+
+def _literal(node: ast.AST) -> Tuple[bool, Any]:
+    try:
+        return True, ast.literal_eval(node)
+    except (ValueError, SyntaxError, TypeError):
+        return False, None
+
+
+def _module_config(tree: ast.Module) -> Dict[str, Any]:
+    """Read a literal module-level SKILL_CONFIG = {...}"""
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "SKILL_CONFIG" for target in node.targets
+        ):
+            ok, value = _literal(node.value)
+            if ok and isinstance(value, dict):
+                return value
+    return {}
+
+
+def parse_skill(name: str, path: Path) -> SkillInfo:
+    """Build a SkillInfo from a skill file's source"""
+    stat = path.stat()
+    source = path.read_bytes()
+    info = SkillInfo(
+        name=name,
+        path=path,
+        content_hash=hashlib.sha256(source).hexdigest(),
+        mtime=stat.st_mtime,
+        size=stat.st_size
+    )
+
+    try:
+        tree = ast.parse(source, filename=str(path))
+    except SyntaxError as e:
+        info.parse_error = f"SyntaxError: {e}"
+        return info
+
+    module_doc = ast.get_docstring(tree)
+    if module_doc:
+        # Skill docstrings open with a "Willow Skill: <Title>" line followed by the description
+        lines = [line.strip() for line in module_doc.strip().splitlines() if line.strip()]
+        info.description = " ".join(lines[1:]) if len(lines) > 1 else lines[0]
+
+    info.config = _module_config(tree)
+
+    execute = next(
+        (node for node in tree.body
+         if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == "execute"),
+        None
+    )
+    if execute is None:
+        return info
+
+    info.has_execute = True
+    info.docstring = ast.get_docstring(execute)
+
+    args = execute.args
+    positional = args.posonlyargs + args.args
+    defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    arguments = list(zip(positional, defaults)) + list(zip(args.kwonlyargs, args.kw_defaults))
+
+    fields = {}
+    for arg, default in arguments:
+        if arg.arg in RUNTIME_PARAMETERS:
+            info.accepts_progress = info.accepts_progress or arg.arg == "progress"
+            continue
+
+        annotation = _annotation_type(arg.annotation)
+        parameter = {
+            "name": arg.arg,
+            "annotation": ast.unparse(arg.annotation) if arg.annotation else None,
+            "required": default is None
+        }
+
+        if default is None:
+            fields[arg.arg] = (annotation, ...)
+        else:
+            ok, value = _literal(default)
+            # Non-literal defaults are evaluated by the skill itself; only unset is valid here
+            parameter["default"] = value if ok else ast.unparse(default)
+            fields[arg.arg] = (annotation, value if ok else None)
+
+        info.parameters.append(parameter)
+
+    extra = "allow" if args.kwarg else "forbid"
+    info.parameter_model = create_model(
+        f"{name}_parameters",
+        __config__=ConfigDict(extra=extra, arbitrary_types_allowed=True),
+        **fields
+    )
+
+    return info
+
+
+class SkillRegistry:
+    """
+    In-memory index of every skill in SKILLS_DIR
+
+    Built once at startup and refreshed by a background thread that polls file
+    mtimes every SKILL_WATCH_INTERVAL seconds. Polling rather than inotify
+    because change events don't reliably cross Docker Desktop bind mounts.
+    Files starting with an underscore are helpers, not skills.
+    """
+
+    def __init__(self, skills_dir: Path):
+        self.skills_dir = skills_dir
+        self._skills: Dict[str, SkillInfo] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    def _skill_files(self) -> Dict[str, Path]:
+        """
+        Skill name -> file for every skill in skills_dir
+
+        Files starting with "_" (e.g. _embedding_cache.py) are shared helpers the
+        skills import - they are never indexed or executable as skills.
+        """
+        if not self.skills_dir.exists():
+            return {}
+        return {
+            path.stem: path
+            for path in self.skills_dir.glob("*.py")
+            if not path.name.startswith("_")
+        }
+
+    def refresh(self) -> List[str]:
+        """
+        Re-index changed, new and deleted skill files
+
+        Returns:
+            Names of skills that were added, changed or removed
+        """
+        files = self._skill_files()
+        changed = []
+
+        with self._lock:
+            skills = dict(self._skills)
+
+        for name in list(skills):
+            if name not in files:
+                del skills[name]
+                changed.append(name)
+
+        for name, path in files.items():
+            current = skills.get(name)
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if current and current.mtime == stat.st_mtime and current.size == stat.st_size:
+                continue
+
+            info = parse_skill(name, path)
+            if current and current.content_hash == info.content_hash:
+                current.mtime, current.size = info.mtime, info.size
+                continue
+
+            skills[name] = info
+            changed.append(name)
+
+        if changed:
+            with self._lock:
+                self._skills = skills
+                self._names = sorted(skills)
+
+        return changed
+
+    def get(self, skill_name: str) -> Optional[SkillInfo]:
+        """Look up a skill, indexing it on the spot if it appeared since the last poll"""
+        info = self._skills.get(skill_name)
+        if info is None and (self.skills_dir / f"{skill_name}.py").exists() and not skill_name.startswith("_"):
+            self.refresh()
+            info = self._skills.get(skill_name)
+        return info
+
+    def names(self) -> List[str]:
+        return self._names
+
+    def validate(self, skill_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Check parameters against the skill's execute() signature before anything runs
+
+        Returns:
+            The parameters coerced to the annotated types (only those the caller set,
+            so the skill's own defaults still apply)
+        """
+        info = self.get(skill_name)
+        if info is None:
+            raise FileNotFoundError(f"Skill '{skill_name}' not found at {self.skills_dir / f'{skill_name}.py'}")
+        if info.parse_error:
+            raise SyntaxError(f"Skill '{skill_name}' could not be parsed: {info.parse_error}")
+        if not info.has_execute:
+            raise AttributeError(f"Skill '{skill_name}' does not have an 'execute' function")
+
+        try:
+            validated = info.parameter_model(**parameters)
+        except ValidationError as e:
+            problems = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'parameters'}: {error['msg']}"
+                for error in e.errors()
+            )
+            raise SkillParameterError(f"Invalid parameters for '{skill_name}': {problems}")
+
+        return validated.model_dump(exclude_unset=True)
+
+    def start_watching(self):
+        """Index everything now and keep polling for changes in a daemon thread"""
+        self.refresh()
+        if self._watcher is None and SKILL_WATCH_INTERVAL > 0:
+            self._watcher = threading.Thread(target=self._watch, name="skill-watcher", daemon=True)
+            self._watcher.start()
+
+    def _watch(self):
+        while not self._stop.wait(SKILL_WATCH_INTERVAL):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Skill registry refresh failed: {e}")
+
+    def stop(self):
+        self._stop.set()
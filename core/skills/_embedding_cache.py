@@ -0,0 +1,248 @@
+"""
+Willow Skill Helper: Embedding Cache
+Content-addressed cache of Ollama embeddings shared by the memory skills
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://frank:11434")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "nomic-embed-text")
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_PATH = Path(os.getenv("EMBEDDING_CACHE_PATH", "/app/data/embeddings.db"))
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "50000"))
+# Texts per Ollama /api/embed request, and how many of those requests run at once
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "2"))
+# Only rewrite an entry's last_used when it is older than this (seconds), so hot hits stay read-only
+_TOUCH_INTERVAL = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    dimensions INTEGER NOT NULL,
+    vector BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings(last_used);
+"""
+
+
+def content_key(model: str, text: str) -> str:
+    """SHA-256 of model + text - the same text embedded by another model is a different entry"""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+def _pack(vector: List[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+class EmbeddingCache:
+    """
+    SQLite table of embeddings keyed by (model, content hash)
+
+    Vectors are stored as packed float32 blobs (3KB for a 768-dim
+    nomic-embed-text vector). When the table grows past max_entries the least
+    recently used tenth is evicted in one go. One connection is shared across
+    threads behind a lock; other processes open their own (WAL mode).
+    """
+
+    def __init__(self, path: Path = EMBEDDING_CACHE_PATH, max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=10)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.executescript(SCHEMA)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, model: str, texts: List[str]) -> Dict[str, List[float]]:
+        """Cached embeddings for whichever of texts have one (text -> vector)"""
+        keys = {content_key(model, text): text for text in texts}
+        if not keys:
+            return {}
+
+        now = time.time()
+        found: Dict[str, List[float]] = {}
+        stale = []
+        with self._lock:
+            key_list = list(keys)
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector, last_used FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for key, blob, last_used in rows:
+                    found[keys[key]] = _unpack(blob)
+                    if now - last_used > _TOUCH_INTERVAL:
+                        stale.append((now, key))
+            if stale:
+                self._conn.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", stale)
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(set(texts)) - len(found)
+        return found
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        return self.get_many(model, [text]).get(text)
+
+    def put_many(self, model: str, embeddings: Dict[str, List[float]]):
+        """Store text -> vector pairs, evicting the least recently used entries if over the limit"""
+        if not embeddings:
+            return
+        now = time.time()
+        rows = [
+            (content_key(model, text), model, len(vector), _pack(vector), now, now)
+            for text, vector in embeddings.items()
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._entries += len(rows)
+            if self._entries > self.max_entries:
+                self._entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+                excess = self._entries - self.max_entries
+                if excess > 0:
+                    evict = excess + self.max_entries // 10
+                    self._conn.execute(
+                        "DELETE FROM embeddings WHERE key IN "
+                        "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                        (evict,)
+                    )
+                    self._entries = max(self._entries - evict, 0)
+            self._conn.commit()
+
+    def put(self, model: str, text: str, vector: List[float]):
+        self.put_many(model, {text: vector})
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None
+        }
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[EmbeddingCache]:
+    """The process-wide cache, opened on first use (None if disabled or the path isn't writable)"""
+    global _cache, EMBEDDING_CACHE_ENABLED
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = EmbeddingCache()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Embedding cache disabled ({EMBEDDING_CACHE_PATH}): {e}")
+                EMBEDDING_CACHE_ENABLED = False
+        return _cache
+
+
+def embed(text: str, model: str = EMBEDDING_MODEL, ollama_url: str = OLLAMA_URL, timeout: float = 10) -> List[float]:
+    """
+    Embedding for text, from the cache or else from Ollama
+
+    Raises whatever requests raises if the text isn't cached and Ollama is
+    unreachable - callers decide whether that is fatal.
+    """
+    cache = get_cache()
+    if cache is not None:
+        vector = cache.get(model, text)
+        if vector is not None:
+            return vector
+
+    response = requests.post(
+        f"{ollama_url}/api/embeddings",
+        json={"model": model, "prompt": text},
+        timeout=timeout
+    )
+    response.raise_for_status()
+    vector = response.json()["embedding"]
+
+    if cache is not None:
+        cache.put(model, text, vector)
+    return vector
+
+
+def _embed_batch(texts: List[str], model: str, ollama_url: str, timeout: float) -> List[List[float]]:
+    """One multi-input /api/embed call (older Ollama without it: one /api/embeddings call per text)"""
+    # /api/embed returns L2-normalised vectors - cosine similarity against /api/embeddings vectors is unchanged
+    response = requests.post(
+        f"{ollama_url}/api/embed",
+        json={"model": model, "input": texts},
+        timeout=timeout
+    )
+    if response.status_code == 404:
+        return [embed(text, model=model, ollama_url=ollama_url, timeout=timeout) for text in texts]
+    response.raise_for_status()
+    embeddings = response.json()["embeddings"]
+    if len(embeddings) != len(texts):
+        raise ValueError(f"Ollama returned {len(embeddings)} embeddings for {len(texts)} inputs")
+    return embeddings
+
+
+def embed_many(
+    texts: List[str],
+    model: str = EMBEDDING_MODEL,
+    ollama_url: str = OLLAMA_URL,
+    timeout: float = 60,
+    batch_size: int = EMBED_BATCH_SIZE,
+    concurrency: int = EMBED_CONCURRENCY
+) -> Dict[str, Optional[List[float]]]:
+    """
+    Embeddings for many texts: cached ones from the cache, the rest from Ollama
+    in batches of batch_size with at most concurrency requests in flight
+
+    Returns:
+        text -> vector, or None for texts whose batch failed (one failed batch doesn't sink the rest)
+    """
+    unique = list(dict.fromkeys(texts))
+    cache = get_cache()
+    found: Dict[str, Optional[List[float]]] = dict(cache.get_many(model, unique)) if cache is not None else {}
+
+    missing = [text for text in unique if text not in found]
+    batches = [missing[start:start + batch_size] for start in range(0, len(missing), max(batch_size, 1))]
+
+    def run(batch: List[str]) -> Dict[str, Optional[List[float]]]:
+        try:
+            vectors = _embed_batch(batch, model, ollama_url, timeout)
+        except Exception as e:
+            print(f"Embedding batch of {len(batch)} failed: {e}")
+            return {text: None for text in batch}
+        embedded = dict(zip(batch, vectors))
+        if cache is not None:
+            cache.put_many(model, embedded)
+        return embedded
+
+    if batches:
+        with ThreadPoolExecutor(max_workers=max(min(concurrency, len(batches)), 1)) as pool:
+            for embedded in pool.map(run, batches):
+                found.update(embedded)
+    return found
@@ -0,0 +1,129 @@
+"""
+Willow Skill Helper: Graph Traversal
+Bounded breadth-first expansion from entry-point nodes, for GraphRAG context
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+DEFAULT_FAN_OUT = 25
+DEFAULT_NODE_BUDGET = 200
+
+_RELATIONSHIP_TYPE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# One hop for a whole frontier. The LIMIT inside the subquery stops expanding a
+# hub after fan_out neighbours instead of walking every relationship it has.
+EXPAND_HOP = """
+    UNWIND $frontier AS source
+    MATCH (n) WHERE elementId(n) = source
+    CALL {{
+        WITH n
+        MATCH (n)-[{relationship}]-(m)
+        WITH DISTINCT m
+        LIMIT $fan_out
+        RETURN m
+    }}
+    RETURN source,
+           elementId(m) AS id,
+           labels(m)[0] AS type,
+           m.name AS name
+"""
+
+
+@dataclass
+class Expansion:
+    """Nodes reached from each entry point, plus what the traversal cost"""
+    reached: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    expanded: int = 0
+    discovered: int = 0
+    truncated: bool = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"expanded": self.expanded, "discovered": self.discovered, "truncated": self.truncated}
+
+
+def _relationship_pattern(relationship_types: Optional[List[str]]) -> str:
+    """Cypher relationship pattern for the allowed types (types can't be parameters, so they are validated)"""
+    if not relationship_types:
+        return ""
+    for relationship_type in relationship_types:
+        if not _RELATIONSHIP_TYPE.match(relationship_type):
+            raise ValueError(f"Invalid relationship type '{relationship_type}'")
+    return ":" + "|".join(relationship_types)
+
+
+def expand(
+    session,
+    start_ids: List[str],
+    max_depth: int,
+    relationship_types: Optional[List[str]] = None,
+    fan_out: int = DEFAULT_FAN_OUT,
+    node_budget: int = DEFAULT_NODE_BUDGET
+) -> Expansion:
+    """
+    Breadth-first expansion from start_ids (element ids), one query per hop
+
+    Each node's neighbours are fetched at most once, however many entry points
+    reach it, and at most fan_out of them per node. Expansion stops at
+    max_depth hops or once node_budget distinct nodes have been discovered -
+    whichever comes first - so the cost is bounded by the budget rather than by
+    the number of paths through hub nodes.
+
+    Args:
+        session: Neo4j session
+        start_ids: Element ids of the entry points
+        max_depth: Maximum hops from an entry point
+        relationship_types: Relationship types to follow (None or empty for any)
+        fan_out: Maximum neighbours taken from any one node
+        node_budget: Maximum distinct nodes discovered across all entry points
+
+    Returns:
+        Expansion with, for every start id, the nodes it reached: {id, type, name, hops}
+    """
+    query = EXPAND_HOP.format(relationship=_relationship_pattern(relationship_types))
+    expansion = Expansion(reached={start_id: [] for start_id in start_ids})
+
+    nodes: Dict[str, Dict[str, Any]] = {}  # every node discovered so far
+    neighbours: Dict[str, List[str]] = {}  # node id -> neighbour ids, for nodes already expanded
+    visited: Dict[str, Set[str]] = {start_id: {start_id} for start_id in start_ids}
+    frontiers: Dict[str, List[str]] = {start_id: [start_id] for start_id in start_ids}
+    known: Set[str] = set(start_ids)  # counted against the budget once they're past the start ids
+
+    for hops in range(1, max_depth + 1):
+        pending = list(dict.fromkeys(
+            node_id for frontier in frontiers.values() for node_id in frontier if node_id not in neighbours
+        ))
+        if pending:
+            for node_id in pending:
+                neighbours[node_id] = []
+            expansion.expanded += len(pending)
+            for record in session.run(query, frontier=pending, fan_out=fan_out):
+                node_id = record["id"]
+                if node_id not in known:
+                    if len(known) - len(start_ids) >= node_budget:
+                        expansion.truncated = True
+                        continue
+                    known.add(node_id)
+                # Entry points reached from another entry point count as context too
+                if node_id not in nodes:
+                    nodes[node_id] = {"id": node_id, "type": record["type"], "name": record["name"]}
+                neighbours[record["source"]].append(node_id)
+
+        for start_id, frontier in frontiers.items():
+            next_frontier = []
+            for node_id in frontier:
+                for neighbour_id in neighbours[node_id]:
+                    if neighbour_id in visited[start_id]:
+                        continue
+                    visited[start_id].add(neighbour_id)
+                    next_frontier.append(neighbour_id)
+                    expansion.reached[start_id].append(dict(nodes[neighbour_id], hops=hops))
+            frontiers[start_id] = next_frontier
+
+        # Out of budget: anything a further hop found would be dropped anyway
+        if expansion.truncated or not any(frontiers.values()):
+            break
+
+    expansion.discovered = len(known) - len(start_ids)
+    return expansion
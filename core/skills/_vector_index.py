@@ -0,0 +1,286 @@
+"""
+Willow Skill Helper: Local Vector Index
+In-process mirror of a Neo4j vector index (willow_memory by default), so
+semantic search doesn't need a round trip to AuraDB
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from neo4j import GraphDatabase
+
+try:
+    import numpy as np
+except ImportError:  # Without NumPy every search falls back to AuraDB
+    np = None
+
+try:
+    import hnswlib
+except ImportError:  # Without hnswlib large indexes are searched brute force
+    hnswlib = None
+
+NEO4J_URI = os.getenv("NEO4J_URI")
+NEO4J_USER = os.getenv("NEO4J_USER")
+NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
+
+LOCAL_VECTOR_INDEX_ENABLED = os.getenv("LOCAL_VECTOR_INDEX_ENABLED", "true").lower() == "true"
+# Pull nodes with a newer timestamp at most this often (seconds)
+LOCAL_VECTOR_INDEX_SYNC_INTERVAL = float(os.getenv("LOCAL_VECTOR_INDEX_SYNC_INTERVAL", "30"))
+# Reload everything this often, to drop deleted nodes and pick up edits that didn't touch timestamp
+LOCAL_VECTOR_INDEX_REBUILD_INTERVAL = float(os.getenv("LOCAL_VECTOR_INDEX_REBUILD_INTERVAL", "3600"))
+# After a write through a memory skill, a search waits this long (seconds) for the sync to catch up
+LOCAL_VECTOR_INDEX_SYNC_WAIT = float(os.getenv("LOCAL_VECTOR_INDEX_SYNC_WAIT", "2"))
+# Brute force below this many vectors, HNSW (if hnswlib is installed) at or above it
+LOCAL_VECTOR_INDEX_HNSW_THRESHOLD = int(os.getenv("LOCAL_VECTOR_INDEX_HNSW_THRESHOLD", "20000"))
+
+INDEX_DEFINITION = """
+    SHOW INDEXES YIELD name, type, labelsOrTypes, properties
+    WHERE name = $name AND type = 'VECTOR'
+    RETURN labelsOrTypes[0] AS label, properties[0] AS property
+"""
+
+# Label and property come from SHOW INDEXES, not from callers
+FETCH_NODES = """
+    MATCH (n:`{label}`)
+    WHERE n.`{property}` IS NOT NULL {since}
+    RETURN elementId(n) AS id,
+           n.title AS title,
+           n.content AS content,
+           n.category AS category,
+           n.timestamp AS timestamp,
+           n.`{property}` AS embedding
+"""
+
+_driver = None
+_driver_lock = threading.Lock()
+
+
+def _get_driver():
+    global _driver
+    with _driver_lock:
+        if _driver is None:
+            _driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+        return _driver
+
+
+def _normalise(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+class LocalVectorIndex:
+    """
+    Embeddings of one Neo4j vector index's nodes, held in memory
+
+    Loaded in full in the background on first use (searches return None, so
+    callers ask AuraDB, until that finishes) and topped up with nodes whose
+    timestamp is at or after the newest one seen (log_memory only sets it on
+    create), with a full reload every LOCAL_VECTOR_INDEX_REBUILD_INTERVAL.
+    Every sync runs in a background thread, so a search never waits on the
+    mirror loading - only briefly after mark_dirty(), so a memory logged a
+    moment ago is found.
+
+    Vectors are unit-normalised float32 rows; search is a matrix product (or
+    an HNSW query past LOCAL_VECTOR_INDEX_HNSW_THRESHOLD vectors). Scores use
+    Neo4j's cosine scale, (1 + cos) / 2, so they match db.index.vector.queryNodes.
+    """
+
+    def __init__(self, name: str, get_driver: Callable = _get_driver):
+        self.name = name
+        self.get_driver = get_driver
+        self.label: Optional[str] = None
+        self.property: Optional[str] = None
+        self.ids: List[str] = []
+        self.rows: List[Dict[str, Any]] = []
+        self.positions: Dict[str, int] = {}
+        self.matrix = None
+        self.ann = None
+        self.since = None
+        self.synced_at = 0.0
+        self.built_at = 0.0
+        self.dirty = False
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._syncing: Optional[threading.Thread] = None
+
+    def _fetch(self, session, since=None) -> List[Dict[str, Any]]:
+        if self.label is None:
+            definition = session.run(INDEX_DEFINITION, name=self.name).single()
+            if definition is None:
+                raise LookupError(f"Vector index '{self.name}' not found")
+            self.label, self.property = definition["label"], definition["property"]
+
+        query = FETCH_NODES.format(
+            label=self.label,
+            property=self.property,
+            since="AND n.timestamp >= $since" if since is not None else ""
+        )
+        return [record.data() for record in session.run(query, since=since)]
+
+    def _build_ann(self):
+        if hnswlib is None or len(self.ids) < LOCAL_VECTOR_INDEX_HNSW_THRESHOLD:
+            self.ann = None
+            return
+        ann = hnswlib.Index(space="cosine", dim=self.matrix.shape[1])
+        ann.init_index(max_elements=len(self.ids) * 2, ef_construction=200, M=16)
+        ann.add_items(self.matrix, np.arange(len(self.ids)))
+        self.ann = ann
+
+    def sync(self, full: bool = False):
+        """Load the whole index (first time, or full=True) or just nodes at or after the newest timestamp"""
+        with self._sync_lock:
+            self.dirty = False
+            full = full or self.matrix is None or time.time() - self.built_at > LOCAL_VECTOR_INDEX_REBUILD_INTERVAL
+            with self.get_driver().session() as session:
+                records = self._fetch(session, None if full else self.since)
+
+            if full:
+                self._replace(records)
+            else:
+                self._upsert(records)
+            self.synced_at = time.time()
+
+    def _replace(self, records: List[Dict[str, Any]]):
+        records = [record for record in records if record["embedding"]]
+        matrix = _normalise(np.array([record.pop("embedding") for record in records], dtype=np.float32)) \
+            if records else None
+        with self._lock:
+            self.ids = [record["id"] for record in records]
+            self.rows = records
+            self.positions = {node_id: position for position, node_id in enumerate(self.ids)}
+            self.matrix = matrix
+            self.since = max((record["timestamp"] for record in records if record["timestamp"] is not None), default=None)
+            if matrix is not None:
+                self._build_ann()
+        self.built_at = time.time()
+
+    def _upsert(self, records: List[Dict[str, Any]]):
+        records = [record for record in records if record["embedding"]]
+        if not records:
+            return
+        vectors = _normalise(np.array([record.pop("embedding") for record in records], dtype=np.float32))
+        with self._lock:
+            if self.matrix is None or vectors.shape[1] != self.matrix.shape[1]:
+                self.built_at = 0  # next sync reloads everything
+                raise ValueError(f"Vector index '{self.name}' changed dimensions")
+            appended = []
+            for record, vector in zip(records, vectors):
+                position = self.positions.get(record["id"])
+                if position is None:
+                    position = len(self.ids)
+                    self.positions[record["id"]] = position
+                    self.ids.append(record["id"])
+                    self.rows.append(record)
+                    appended.append(vector)
+                else:
+                    self.rows[position] = record
+                    self.matrix[position] = vector
+                if record["timestamp"] is not None and (self.since is None or record["timestamp"] > self.since):
+                    self.since = record["timestamp"]
+            if appended:
+                self.matrix = np.vstack([self.matrix, np.array(appended)])
+            if self.ann is not None:
+                if len(self.ids) > self.ann.get_max_elements():
+                    self.ann.resize_index(len(self.ids) * 2)
+                positions = np.array([self.positions[record["id"]] for record in records])
+                self.ann.add_items(self.matrix[positions], positions)
+            elif len(self.ids) >= LOCAL_VECTOR_INDEX_HNSW_THRESHOLD:
+                self._build_ann()
+
+    def _sync_in_background(self):
+        def run():
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"Local vector index '{self.name}' sync failed: {e}")
+
+        with self._lock:
+            if self._syncing is None or not self._syncing.is_alive():
+                self._syncing = threading.Thread(target=run, name=f"vector-index-{self.name}", daemon=True)
+                self._syncing.start()
+            return self._syncing
+
+    def search(self, vector: List[float], limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Nearest nodes to vector, best first, or None if the local index can't answer
+        (still loading, or the query has a different dimension)
+        """
+        if not self.built_at:
+            self._sync_in_background()
+            return None
+        if self.dirty or time.time() - self.synced_at > LOCAL_VECTOR_INDEX_SYNC_INTERVAL:
+            syncing = self._sync_in_background()
+            if self.dirty:
+                syncing.join(LOCAL_VECTOR_INDEX_SYNC_WAIT)
+
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        with self._lock:
+            if self.matrix is None or query.shape[0] != self.matrix.shape[1]:
+                return None
+            if limit < 1:
+                return []
+            query = query / (norm or 1)
+            count = min(limit, len(self.ids))
+
+            if self.ann is not None:
+                self.ann.set_ef(max(count * 4, 64))
+                positions, distances = self.ann.knn_query(query, k=count)
+                matches = zip(positions[0], 1 - distances[0])
+            else:
+                scores = self.matrix @ query
+                best = np.argpartition(-scores, count - 1)[:count]
+                best = best[np.argsort(-scores[best])]
+                matches = zip(best, scores[best])
+
+            return [
+                dict(self.rows[int(position)], score=float((1 + cosine) / 2))
+                for position, cosine in matches
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "label": self.label,
+            "vectors": len(self.ids),
+            "method": "hnsw" if self.ann is not None else "brute_force",
+            "synced_at": self.synced_at,
+            "built_at": self.built_at
+        }
+
+
+_indexes: Dict[str, LocalVectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(name: str) -> Optional[LocalVectorIndex]:
+    """The process-wide mirror of a vector index (None if disabled or NumPy isn't installed)"""
+    if not LOCAL_VECTOR_INDEX_ENABLED or np is None:
+        return None
+    with _indexes_lock:
+        index = _indexes.get(name)
+        if index is None:
+            index = _indexes[name] = LocalVectorIndex(name)
+        return index
+
+
+def search(name: str, vector: List[float], limit: int) -> Optional[List[Dict[str, Any]]]:
+    """Search the local mirror of a vector index, or None if the caller should ask Neo4j instead"""
+    index = get_index(name)
+    if index is None:
+        return None
+    try:
+        return index.search(vector, limit)
+    except Exception as e:
+        print(f"Local vector index '{name}' unavailable: {e}")
+        return None
+
+
+def mark_dirty():
+    """Called after writing memory nodes, so the next search syncs before answering"""
+    with _indexes_lock:
+        for index in _indexes.values():
+            index.dirty = True
@@ -12,6 +12,8 @@ DB_NAME = os.getenv("PG_DB", "population")
 DB_USER = os.getenv("PG_USER", "willow")
 DB_PASS = os.getenv("PG_PASS", "willowdev123")
 
+SKILL_CONFIG = {"coalesce": True}
+
 def execute() -> dict:
     """
     Check the population database for current entity counts
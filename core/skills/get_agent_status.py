@@ -11,6 +11,8 @@ NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 
+SKILL_CONFIG = {"coalesce": True, "cache_ttl": 60, "reads": ["Agent", "Task"]}
+
 def execute() -> dict:
     """
     Get the status of all agents in the swarm
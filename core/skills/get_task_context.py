@@ -12,6 +12,12 @@ NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 
+SKILL_CONFIG = {
+    "coalesce": True,
+    "cache_ttl": 60,
+    "reads": ["Domain", "Component", "Task", "Specification", "TestCriteria", "DiaryEntry", "Message", "RFC"]
+}
+
 
 def execute(task_path: str) -> dict:
     """
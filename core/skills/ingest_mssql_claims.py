@@ -17,6 +17,8 @@ MSSQL_DATABASE = os.getenv("MSSQL_DATABASE", None)
 MSSQL_USER = os.getenv("MSSQL_USER", None)
 MSSQL_PASSWORD = os.getenv("MSSQL_PASSWORD", None)
 
+SKILL_CONFIG = {"pool": "thread", "max_concurrency": 1, "timeout": 600}
+
 def execute(table: str, limit: int = 100) -> dict:
     """
     Read data from MSSQL and transform to Neo4j graph nodes
@@ -6,7 +6,7 @@ Reads sample data from the Population DB (Postgres) and creates nodes in the Gra
 import os
 import psycopg2
 from neo4j import GraphDatabase
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional
 
 # Postgres Configuration (Xeon Server)
 PG_HOST = os.getenv("POSTGRES_HOST", "bunny") # Default to bunny hostname
@@ -20,12 +20,15 @@ NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "willowdev123")
 
-def execute(limit: int = 10) -> Dict[str, Any]:
+SKILL_CONFIG = {"pool": "thread", "max_concurrency": 1, "timeout": 600, "writes": ["Person", "Quote"]}
+
+def execute(limit: int = 10, progress: Optional[Callable] = None) -> Dict[str, Any]:
     """
     Ingest a sample of people and quotes from Postgres to Neo4j.
     
     Args:
         limit: Number of records to ingest (default: 10)
+        progress: Optional callback(current, total, message), supplied when run as a willow-api job
     """
     
     results = {
@@ -66,34 +69,39 @@ def execute(limit: int = 10) -> Dict[str, Any]:
         # 3. Connect to Neo4j
         driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
         
-        with driver.session() as session:
-            for row in rows:
-                p_id, p_first, p_last, p_risk, q_id, q_product, q_premium, q_status = row
-                
-                # Create Person and Quote nodes
-                session.run("""
-                    MERGE (p:Person {id: $p_id})
-                    SET p.first_name = $p_first,
-                        p.last_name = $p_last,
-                        p.risk_score = $p_risk,
-                        p.source = 'population_db'
+        try:
+            with driver.session() as session:
+                for row in rows:
+                    p_id, p_first, p_last, p_risk, q_id, q_product, q_premium, q_status = row
                     
-                    MERGE (q:Quote {id: $q_id})
-                    SET q.product = $q_product,
-                        q.premium = $q_premium,
-                        q.status = $q_status,
-                        q.ingested_at = datetime()
+                    # Create Person and Quote nodes
+                    session.run("""
+                        MERGE (p:Person {id: $p_id})
+                        SET p.first_name = $p_first,
+                            p.last_name = $p_last,
+                            p.risk_score = $p_risk,
+                            p.source = 'population_db'
+                        
+                        MERGE (q:Quote {id: $q_id})
+                        SET q.product = $q_product,
+                            q.premium = $q_premium,
+                            q.status = $q_status,
+                            q.ingested_at = datetime()
+                        
+                        MERGE (p)-[:HAS_QUOTE]->(q)
+                    """, {
+                        "p_id": str(p_id), "p_first": p_first, "p_last": p_last, "p_risk": float(p_risk),
+                        "q_id": str(q_id), "q_product": q_product, "q_premium": float(q_premium), "q_status": q_status
+                    })
                     
-                    MERGE (p)-[:HAS_QUOTE]->(q)
-                """, {
-                    "p_id": str(p_id), "p_first": p_first, "p_last": p_last, "p_risk": float(p_risk),
-                    "q_id": str(q_id), "q_product": q_product, "q_premium": float(q_premium), "q_status": q_status
-                })
-                
-                results["people_ingested"] += 1
-                results["quotes_ingested"] += 1
+                    results["people_ingested"] += 1
+                    results["quotes_ingested"] += 1
+
+                    if progress:
+                        progress(results["people_ingested"], len(rows), f"Ingested person {p_id}")
+        finally:
+            driver.close()
 
-        driver.close()
         return {"success": True, "message": "Ingestion complete", "data": results}
 
     except Exception as e:
@@ -0,0 +1,185 @@
+"""
+Willow Skill: Log Memories in Bulk
+Store many decisions, ideas, insights, or memories at once: embeddings in
+batches, nodes and RELATES_TO links with a handful of UNWIND statements
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from neo4j import GraphDatabase
+import os
+import certifi
+
+from _embedding_cache import EMBED_BATCH_SIZE, EMBED_CONCURRENCY, embed_many
+from _vector_index import mark_dirty
+
+NEO4J_URI = os.getenv("NEO4J_URI")
+NEO4J_USER = os.getenv("NEO4J_USER")
+NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://frank:11434")
+
+MEMORY_TYPES = ("Memory", "Decision", "Idea", "Insight")
+# Memories per write transaction
+WRITE_CHUNK_SIZE = 500
+
+SKILL_CONFIG = {"pool": "thread", "max_concurrency": 2, "timeout": 300, "writes": ["Memory", "Decision", "Idea", "Insight"]}
+
+# One statement per memory type - labels can't be parameters
+CREATE_MEMORIES = """
+    UNWIND $rows AS row
+    CREATE (m:{memory_type})
+    SET m.content = row.content,
+        m.title = row.title,
+        m.category = row.category,
+        m.timestamp = datetime(),
+        m.status = 'Active',
+        m.embedding = row.embedding
+    RETURN row.index AS index, elementId(m) AS id
+"""
+
+# Look every target up once, then link each new memory to its matches
+LINK_MEMORIES = """
+    OPTIONAL MATCH (e)
+    WHERE e.name IN $targets OR e.title IN $targets
+    WITH collect(e) AS entities
+    UNWIND $links AS link
+    MATCH (m) WHERE elementId(m) = link.id
+    WITH m, link, [e IN entities WHERE e <> m AND (e.name = link.target OR e.title = link.target)] AS targets
+    FOREACH (e IN targets | MERGE (m)-[:RELATES_TO]->(e))
+    RETURN link.index AS index, size(targets) AS linked
+"""
+
+
+def _prepare(index: int, memory: Any) -> Dict[str, Any]:
+    """Normalise one input item, raising ValueError if it can't be stored"""
+    if not isinstance(memory, dict):
+        raise ValueError("memory must be an object")
+    content = memory.get("content")
+    if not isinstance(content, str) or not content.strip():
+        raise ValueError("content is required")
+    memory_type = memory.get("memory_type") or "Memory"
+    if memory_type not in MEMORY_TYPES:
+        raise ValueError(f"memory_type must be one of {', '.join(MEMORY_TYPES)}")
+    return {
+        "index": index,
+        "memory_type": memory_type,
+        "content": content,
+        "title": memory.get("title") or content[:50],
+        "category": memory.get("category"),
+        "relates_to": memory.get("relates_to"),
+        "embedding": None
+    }
+
+
+def _write_chunk(tx, rows: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    written: Dict[int, Dict[str, Any]] = {}
+    for memory_type in MEMORY_TYPES:
+        typed = [row for row in rows if row["memory_type"] == memory_type]
+        if not typed:
+            continue
+        result = tx.run(CREATE_MEMORIES.format(memory_type=memory_type), rows=typed)
+        for record in result:
+            written[record["index"]] = {"id": record["id"], "linked": 0}
+
+    links = [
+        {"index": row["index"], "id": written[row["index"]]["id"], "target": row["relates_to"]}
+        for row in rows if row["relates_to"] and row["index"] in written
+    ]
+    if links:
+        result = tx.run(LINK_MEMORIES, links=links, targets=list({link["target"] for link in links}))
+        for record in result:
+            written[record["index"]]["linked"] = record["linked"]
+    return written
+
+
+def execute(
+    memories: List[dict],
+    generate_embedding: bool = True,
+    batch_size: int = EMBED_BATCH_SIZE,
+    concurrency: int = EMBED_CONCURRENCY,
+    progress: Optional[Callable] = None
+) -> dict:
+    """
+    Log many memories, decisions, ideas, or insights to the graph
+
+    Args:
+        memories: List of {content, memory_type?, title?, category?, relates_to?} - same fields as log_memory
+        generate_embedding: Whether to generate vector embeddings (default: True)
+        batch_size: Texts per Ollama embed request (default: 32)
+        concurrency: Embed requests in flight at once (default: 2)
+        progress: Optional callback(current, total, message), supplied when run as a willow-api job
+
+    Returns:
+        dict with counts and one status entry per input item, in input order
+    """
+    os.environ['SSL_CERT_FILE'] = certifi.where()
+    os.environ['REQUESTS_CA_BUNDLE'] = certifi.where()
+
+    items: List[Dict[str, Any]] = []
+    rows: List[Dict[str, Any]] = []
+    for index, memory in enumerate(memories):
+        try:
+            rows.append(_prepare(index, memory))
+            items.append({"index": index, "status": "pending"})
+        except ValueError as e:
+            items.append({"index": index, "status": "invalid", "error": str(e)})
+
+    # Embed every distinct text once, in batches (GraphRAG: Unstructured Memory)
+    if generate_embedding and rows:
+        if progress:
+            progress(0, len(rows), f"Embedding {len(rows)} memories")
+        embeddings = embed_many(
+            [row["content"] for row in rows],
+            ollama_url=OLLAMA_URL,
+            batch_size=batch_size,
+            concurrency=concurrency
+        )
+        for row in rows:
+            row["embedding"] = embeddings.get(row["content"])
+
+    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+
+    try:
+        with driver.session() as session:
+            for start in range(0, len(rows), WRITE_CHUNK_SIZE):
+                chunk = rows[start:start + WRITE_CHUNK_SIZE]
+                try:
+                    written = session.execute_write(_write_chunk, chunk)
+                except Exception as e:
+                    # The chunk's transaction rolled back - earlier chunks stay committed
+                    for row in chunk:
+                        items[row["index"]].update(status="failed", error=str(e))
+                    continue
+
+                for row in chunk:
+                    item = items[row["index"]]
+                    if row["index"] not in written:
+                        item.update(status="failed", error="node was not created")
+                        continue
+                    item.update(
+                        status="created",
+                        type=row["memory_type"],
+                        title=row["title"],
+                        has_embedding=row["embedding"] is not None
+                    )
+                    if row["relates_to"]:
+                        item["linked"] = written[row["index"]]["linked"]
+
+                if progress:
+                    progress(min(start + WRITE_CHUNK_SIZE, len(rows)), len(rows), "Wrote memories")
+
+            # Searches in this process sync the local vector index before answering
+            mark_dirty()
+    except Exception as e:
+        return {"success": False, "error": str(e), "results": items}
+    finally:
+        driver.close()
+
+    created = sum(1 for item in items if item["status"] == "created")
+    return {
+        "success": True,
+        "created": created,
+        "failed": len(items) - created,
+        "with_embedding": sum(1 for item in items if item.get("has_embedding")),
+        "message": f"{created} of {len(items)} memories logged to graph",
+        "results": items
+    }
@@ -8,13 +8,17 @@ from typing import Optional
 from neo4j import GraphDatabase
 import os
 import certifi
-import requests
+
+from _embedding_cache import embed
+from _vector_index import mark_dirty
 
 NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://frank:11434")
 
+SKILL_CONFIG = {"writes": ["Memory", "Decision", "Idea", "Insight"]}
+
 def execute(
     content: str,
     memory_type: str = "Memory",
@@ -44,12 +48,7 @@ def execute(
     embedding = None
     if generate_embedding:
         try:
-            response = requests.post(
-                f"{OLLAMA_URL}/api/embeddings",
-                json={"model": "nomic-embed-text", "prompt": content},
-                timeout=10
-            )
-            embedding = response.json()["embedding"]
+            embedding = embed(content, ollama_url=OLLAMA_URL)
         except:
             pass  # Continue without embedding if Frank is unreachable
     
@@ -80,6 +79,9 @@ def execute(
                     MERGE (m)-[:RELATES_TO]->(e)
                 """, content=content, relates_to=relates_to)
             
+            # Searches in this process sync the local vector index before answering
+            mark_dirty()
+            
             return {
                 "success": True,
                 "type": memory_type,
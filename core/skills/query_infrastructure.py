@@ -13,6 +13,8 @@ NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 
+SKILL_CONFIG = {"coalesce": True, "cache_ttl": 30, "reads": ["Infrastructure"]}
+
 def execute(node_name: Optional[str] = None) -> dict:
     """
     Query the infrastructure status from the graph and optionally ping the node
@@ -12,6 +12,8 @@ NEO4J_URI = os.getenv("NEO4J_URI", "neo4j+s://e59298d2.databases.neo4j.io")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "c2U7h1mwvmYn2k2cr_Fp9EaUrZaLZdEQ3_Cawt6zvyU")
 
+SKILL_CONFIG = {"coalesce": True, "cache_ttl": 60, "reads": ["Task", "Sprint", "Decision", "Skill"]}
+
 def execute(
     status: Optional[str] = None,
     priority: Optional[str] = None,
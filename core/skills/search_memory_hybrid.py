@@ -1,96 +1,203 @@
 """
 Willow Skill: Hybrid Memory Search
-Implements full GraphRAG pattern: Vector entry point + Graph traversal for context
+Implements full GraphRAG pattern: Vector + full-text entry points (rank fused) + Graph traversal for context
 """
 
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 from neo4j import GraphDatabase
 import os
+import re
 import certifi
-import requests
+
+from _embedding_cache import embed
+from _graph_traversal import DEFAULT_FAN_OUT, DEFAULT_NODE_BUDGET, expand
+from _vector_index import search as vector_search
 
 NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://frank:11434")
 
-def execute(query: str, limit: int = 5, traverse_depth: int = 2) -> dict:
+VECTOR_INDEX = "willow_memory"
+# Created by bootstrap/create_vector_index.py over title/content of Memory, Decision, Idea and Insight nodes
+FULLTEXT_INDEX = "willow_memory_text"
+# Reciprocal rank fusion constant - dampens the weight of the very top ranks
+RRF_K = 60
+# Candidates taken from each list before fusing, per requested result
+CANDIDATES_PER_RESULT = 4
+
+SKILL_CONFIG = {"pool": "thread", "max_concurrency": 4, "timeout": 30}
+
+_LUCENE_SPECIAL = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+def lucene_query(text: str) -> str:
+    """
+    Full-text query for raw user text: the exact phrase (boosted) or any of its terms
+
+    Lucene syntax is escaped, so "WILL-009" searches for WILL-009 rather than WILL NOT 009.
+    """
+    escaped = _LUCENE_SPECIAL.sub(r"\\\1", text.strip())
+    phrase = text.strip().replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{phrase}"^2 OR ({escaped})'
+
+
+def rrf(rankings: Dict[str, List[str]], k: int = RRF_K) -> List[Dict[str, Any]]:
+    """
+    Reciprocal rank fusion: each id scores sum(1 / (k + rank)) over the lists it appears in
+
+    Returns:
+        [{"id", "rrf_score", "ranks": {list name: 1-based rank}}] best first
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for name, ids in rankings.items():
+        for rank, node_id in enumerate(ids, start=1):
+            entry = fused.setdefault(node_id, {"id": node_id, "rrf_score": 0.0, "ranks": {}})
+            entry["rrf_score"] += 1 / (k + rank)
+            entry["ranks"][name] = rank
+    return sorted(fused.values(), key=lambda entry: entry["rrf_score"], reverse=True)
+
+
+def _vector_candidates(driver, query: str, limit: int) -> List[Dict[str, Any]]:
+    query_embedding = embed(query, ollama_url=OLLAMA_URL)
+
+    # Local mirror of the index first; None means it can't answer and AuraDB should
+    matches = vector_search(VECTOR_INDEX, query_embedding, limit)
+    if matches is not None:
+        return [{"id": match["id"], "score": match["score"]} for match in matches]
+
+    with driver.session() as session:
+        result = session.run("""
+            CALL db.index.vector.queryNodes($index, $limit, $embedding)
+            YIELD node, score
+            RETURN elementId(node) AS id, score
+            ORDER BY score DESC
+        """, index=VECTOR_INDEX, limit=limit, embedding=query_embedding)
+        return [record.data() for record in result]
+
+
+def _text_candidates(driver, query: str, limit: int) -> List[Dict[str, Any]]:
+    with driver.session() as session:
+        result = session.run("""
+            CALL db.index.fulltext.queryNodes($index, $text, {limit: $limit})
+            YIELD node, score
+            RETURN elementId(node) AS id, score
+        """, index=FULLTEXT_INDEX, text=lucene_query(query), limit=limit)
+        return [record.data() for record in result]
+
+
+def execute(
+    query: str,
+    limit: int = 5,
+    traverse_depth: int = 2,
+    relationship_types: Optional[List[str]] = None,
+    fan_out: int = DEFAULT_FAN_OUT,
+    node_budget: int = DEFAULT_NODE_BUDGET
+) -> dict:
     """
     GraphRAG Hybrid Search:
-    1. Use vector similarity to find entry points
-    2. Traverse graph relationships to gather context
-    3. Return enriched results with connected knowledge
-    
+    1. Find entry points by vector similarity and by full-text (BM25) match, in parallel
+    2. Merge the two rankings with reciprocal rank fusion
+    3. Expand breadth-first from the entry points to gather context (bounded by fan_out and node_budget)
+    4. Return enriched results with connected knowledge
+
     Args:
         query: The search query text
         limit: Maximum number of entry points (default: 5)
         traverse_depth: How many hops to traverse for context (default: 2)
-    
+        relationship_types: Relationship types to follow, e.g. ["RELATES_TO", "HAS_DECISION"] (default: any)
+        fan_out: Maximum neighbours taken from any one node per hop, so hubs don't explode (default: 25)
+        node_budget: Maximum distinct context nodes across all results (default: 200)
+
     Returns:
         dict with memories and their connected context (decisions, components, agents)
     """
     os.environ['SSL_CERT_FILE'] = certifi.where()
     os.environ['REQUESTS_CA_BUNDLE'] = certifi.where()
-    
+
+    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+
     try:
-        # Step 1: Vector Search (Fuzzy Entry Point)
-        response = requests.post(
-            f"{OLLAMA_URL}/api/embeddings",
-            json={"model": "nomic-embed-text", "prompt": query},
-            timeout=10
-        )
-        query_embedding = response.json()["embedding"]
-        
-        driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
-        
+        # Step 1: Vector (fuzzy) and full-text (exact identifiers, names) entry points side by side.
+        # Either one failing - Frank offline with the query uncached, index missing - leaves the other.
+        candidates = max(limit * CANDIDATES_PER_RESULT, 20)
+        searches = {"vector": _vector_candidates, "text": _text_candidates}
+        rankings: Dict[str, List[Dict[str, Any]]] = {}
+        errors: Dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=len(searches)) as pool:
+            futures = {name: pool.submit(search, driver, query, candidates) for name, search in searches.items()}
+            for name, future in futures.items():
+                try:
+                    rankings[name] = future.result()
+                except Exception as e:
+                    errors[name] = str(e)
+
+        if not rankings:
+            return {"success": False, "error": "; ".join(f"{name} search: {error}" for name, error in errors.items()), "query": query}
+
+        # Step 2: Reciprocal rank fusion
+        scores = {name: {match["id"]: match["score"] for match in matches} for name, matches in rankings.items()}
+        entries = rrf({name: [match["id"] for match in matches] for name, matches in rankings.items()})[:limit]
+
         with driver.session() as session:
-            # Step 2: Vector search + Graph traversal (GraphRAG Core)
-            result = session.run(f"""
-                CALL db.index.vector.queryNodes('willow_memory', $limit, $embedding)
-                YIELD node, score
-                
-                // Now traverse from each found node to gather context
-                CALL {{
-                    WITH node
-                    MATCH path = (node)-[*1..{traverse_depth}]-(connected)
-                    RETURN node, 
-                           collect(DISTINCT labels(connected)[0]) as connected_types,
-                           collect(DISTINCT connected.name) as connected_names
-                }}
-                
-                RETURN node.title as title,
+            result = session.run("""
+                UNWIND $ids AS id
+                MATCH (node) WHERE elementId(node) = id
+                RETURN id,
+                       node.title as title,
                        node.content as content,
                        node.category as category,
-                       node.timestamp as timestamp,
-                       score,
-                       connected_types,
-                       connected_names
-                ORDER BY score DESC
-            """, limit=limit, embedding=query_embedding)
-            
-            memories = []
-            for record in result:
-                memories.append({
-                    "title": record["title"],
-                    "content": record["content"],
-                    "category": record["category"],
-                    "timestamp": str(record["timestamp"]),
-                    "similarity": round(record["score"], 3),
-                    "context": {
-                        "types": list(set(record["connected_types"])),
-                        "entities": list(set([n for n in record["connected_names"] if n]))
-                    }
-                })
-            
-            driver.close()
-            
-            return {
-                "success": True,
-                "query": query,
-                "method": "GraphRAG (Vector + Traversal)",
-                "results": memories,
-                "count": len(memories)
-            }
-            
+                       node.timestamp as timestamp
+            """, ids=[entry["id"] for entry in entries])
+            nodes = {record["id"]: record for record in result}
+
+            # Step 3: Bounded breadth-first expansion from the fused entry points (GraphRAG Core)
+            expansion = expand(
+                session,
+                list(nodes),
+                traverse_depth,
+                relationship_types=relationship_types,
+                fan_out=fan_out,
+                node_budget=node_budget
+            )
+
+        memories = []
+        for entry in entries:
+            record = nodes.get(entry["id"])
+            if record is None:
+                continue  # Deleted since the local vector index last synced
+            vector_score = scores.get("vector", {}).get(entry["id"])
+            text_score = scores.get("text", {}).get(entry["id"])
+            connected = expansion.reached.get(entry["id"], [])
+            memories.append({
+                "title": record["title"],
+                "content": record["content"],
+                "category": record["category"],
+                "timestamp": str(record["timestamp"]),
+                "similarity": round(vector_score, 3) if vector_score is not None else None,
+                "text_score": round(text_score, 3) if text_score is not None else None,
+                "rrf_score": round(entry["rrf_score"], 5),
+                "matched_by": sorted(entry["ranks"]),
+                "context": {
+                    "types": list(set([c["type"] for c in connected if c["type"]])),
+                    "entities": list(set([c["name"] for c in connected if c["name"]]))
+                }
+            })
+
+        response = {
+            "success": True,
+            "query": query,
+            "method": "GraphRAG (Vector + Full-text, RRF + Traversal)",
+            "results": memories,
+            "count": len(memories),
+            "traversal": expansion.stats()
+        }
+        if errors:
+            response["warnings"] = [f"{name} search failed: {error}" for name, error in errors.items()]
+        return response
+
     except Exception as e:
         return {"success": False, "error": str(e), "query": query}
+    finally:
+        driver.close()
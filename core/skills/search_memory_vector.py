@@ -7,14 +7,16 @@ from typing import Optional
 from neo4j import GraphDatabase
 import os
 import certifi
-import requests
+
+from _embedding_cache import embed
+from _vector_index import search as vector_search
 
 NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://frank:11434")
 
-def execute(query: str, limit: int = 5, index_name: str = "willow_memory") -> dict:
+def execute(query: str, limit: int = 5, index_name: str = "willow_memory", use_local_index: bool = True) -> dict:
     """
     Search memories using semantic similarity (vector search)
     
@@ -22,6 +24,7 @@ def execute(query: str, limit: int = 5, index_name: str = "willow_memory") -> di
         query: The search query text
         limit: Maximum number of results (default: 5)
         index_name: Vector index to search (willow_memory, willow_ideas)
+        use_local_index: Search the in-process mirror of the index, falling back to AuraDB (default: True)
     
     Returns:
         dict with matching memories and similarity scores
@@ -30,48 +33,51 @@ def execute(query: str, limit: int = 5, index_name: str = "willow_memory") -> di
     os.environ['REQUESTS_CA_BUNDLE'] = certifi.where()
     
     try:
-        # Generate embedding for the query using Ollama
-        response = requests.post(
-            f"{OLLAMA_URL}/api/embeddings",
-            json={"model": "nomic-embed-text", "prompt": query},
-            timeout=10
-        )
-        query_embedding = response.json()["embedding"]
+        # Generate embedding for the query (cached by content, else Ollama)
+        query_embedding = embed(query, ollama_url=OLLAMA_URL)
         
-        # Search the graph
-        driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+        # Local mirror of the index first; None means it can't answer and AuraDB should
+        matches = vector_search(index_name, query_embedding, limit) if use_local_index else None
+        source = "local"
         
-        with driver.session() as session:
-            # Use vector similarity search
-            result = session.run("""
-                CALL db.index.vector.queryNodes($index, $limit, $embedding)
-                YIELD node, score
-                RETURN node.title as title, 
-                       node.content as content,
-                       node.category as category,
-                       node.timestamp as timestamp,
-                       score
-                ORDER BY score DESC
-            """, index=index_name, limit=limit, embedding=query_embedding)
-            
-            memories = []
-            for record in result:
-                memories.append({
-                    "title": record["title"],
-                    "content": record["content"],
-                    "category": record["category"],
-                    "timestamp": str(record["timestamp"]),
-                    "similarity": round(record["score"], 3)
-                })
-            
-            driver.close()
+        if matches is None:
+            source = "auradb"
+            driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
             
-            return {
-                "success": True,
-                "query": query,
-                "results": memories,
-                "count": len(memories)
-            }
+            try:
+                with driver.session() as session:
+                    # Use vector similarity search
+                    result = session.run("""
+                        CALL db.index.vector.queryNodes($index, $limit, $embedding)
+                        YIELD node, score
+                        RETURN node.title as title, 
+                               node.content as content,
+                               node.category as category,
+                               node.timestamp as timestamp,
+                               score
+                        ORDER BY score DESC
+                    """, index=index_name, limit=limit, embedding=query_embedding)
+                    matches = [record.data() for record in result]
+            finally:
+                driver.close()
+        
+        memories = []
+        for match in matches:
+            memories.append({
+                "title": match["title"],
+                "content": match["content"],
+                "category": match["category"],
+                "timestamp": str(match["timestamp"]),
+                "similarity": round(match["score"], 3)
+            })
+        
+        return {
+            "success": True,
+            "query": query,
+            "results": memories,
+            "count": len(memories),
+            "source": source
+        }
             
     except Exception as e:
         return {"success": False, "error": str(e), "query": query}
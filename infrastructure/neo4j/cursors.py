@@ -0,0 +1,150 @@
+"""
+Willow Neo4j MCP Server - Result Cursors
+Server-side cursors over open results, so large reads can be fetched a page at a time
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from neo4j import READ_ACCESS, Query
+
+CURSOR_IDLE_TIMEOUT = float(os.getenv("CURSOR_IDLE_TIMEOUT", "60"))
+CURSOR_MAX_OPEN = int(os.getenv("CURSOR_MAX_OPEN", "32"))
+CURSOR_MAX_PAGE_SIZE = int(os.getenv("CURSOR_MAX_PAGE_SIZE", "5000"))
+
+
+class CursorError(ValueError):
+    """Raised for unknown/expired cursors or when too many are open"""
+
+
+@dataclass
+class Cursor:
+    id: str
+    query: str
+    parameters: Dict[str, Any]
+    session: Any
+    result: Any
+    timeout: Optional[float] = None
+    fetched: int = 0
+    opened_at: float = field(default_factory=time.perf_counter)
+    last_used: float = field(default_factory=time.monotonic)
+    summary: Any = None  # set once the result has been read to the end
+    failed: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class CursorRegistry:
+    """
+    Open read results that callers page through with a continuation token
+
+    Each cursor holds a session (and so a pooled connection) until it is
+    exhausted, closed, or idle for CURSOR_IDLE_TIMEOUT seconds. Records are
+    pulled from the server in fetch_size batches matching the page size, so
+    only about one page is ever held in memory per cursor.
+    """
+
+    def __init__(self, on_close: Optional[Callable[[Cursor], None]] = None):
+        self._cursors: Dict[str, Cursor] = {}
+        self._reaper: Optional[asyncio.Task] = None
+        # Called with every cursor as it closes (used to time and log the execution once, with the full count)
+        self.on_close = on_close
+
+    async def open(
+        self,
+        driver,
+        query: str,
+        parameters: Dict[str, Any],
+        page_size: int,
+        timeout: Optional[float] = None
+    ) -> Cursor:
+        if len(self._cursors) >= CURSOR_MAX_OPEN:
+            await self.reap()
+        if len(self._cursors) >= CURSOR_MAX_OPEN:
+            raise CursorError(f"Too many open cursors ({CURSOR_MAX_OPEN}) - fetch to the end or close some")
+
+        session = driver.session(default_access_mode=READ_ACCESS, fetch_size=page_size)
+        try:
+            result = await session.run(Query(query, timeout=timeout), parameters)
+        except BaseException:
+            await session.close()
+            raise
+
+        cursor = Cursor(
+            id=uuid.uuid4().hex, query=query, parameters=parameters, session=session, result=result, timeout=timeout
+        )
+        self._cursors[cursor.id] = cursor
+        return cursor
+
+    async def page(self, cursor: Cursor, page_size: int) -> Tuple[List[dict], Optional[str]]:
+        """
+        Fetch the next page
+
+        Returns:
+            (records, next cursor id) - next cursor id is None once the result is exhausted
+        """
+        async with cursor.lock:
+            cursor.last_used = time.monotonic()
+            try:
+                records = [dict(record) for record in await cursor.result.fetch(page_size)]
+                cursor.fetched += len(records)
+                more = len(records) == page_size and await cursor.result.peek() is not None
+                if not more:
+                    cursor.summary = await cursor.result.consume()
+            except Exception:
+                cursor.failed = True
+                raise
+
+        if not more:
+            await self.close(cursor.id)
+            return records, None
+        return records, cursor.id
+
+    def get(self, cursor_id: str) -> Cursor:
+        cursor = self._cursors.get(cursor_id)
+        if cursor is None:
+            raise CursorError(f"Cursor '{cursor_id}' not found (finished, closed or expired)")
+        return cursor
+
+    async def close(self, cursor_id: str) -> bool:
+        """Close a cursor and release its connection. Returns True if it was open."""
+        cursor = self._cursors.pop(cursor_id, None)
+        if cursor is None:
+            return False
+        try:
+            await cursor.session.close()
+        except Exception as e:
+            print(f"Failed to close cursor {cursor_id}: {e}")
+        if self.on_close is not None:
+            self.on_close(cursor)
+        return True
+
+    async def reap(self) -> int:
+        """Close cursors idle for longer than CURSOR_IDLE_TIMEOUT"""
+        cutoff = time.monotonic() - CURSOR_IDLE_TIMEOUT
+        idle = [cursor.id for cursor in self._cursors.values() if cursor.last_used < cutoff and not cursor.lock.locked()]
+        for cursor_id in idle:
+            await self.close(cursor_id)
+        return len(idle)
+
+    def start(self):
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap_forever())
+
+    async def _reap_forever(self):
+        while True:
+            await asyncio.sleep(max(CURSOR_IDLE_TIMEOUT / 4, 1))
+            await self.reap()
+
+    async def close_all(self):
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        for cursor_id in list(self._cursors):
+            await self.close(cursor_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"open": len(self._cursors), "max_open": CURSOR_MAX_OPEN}
@@ -0,0 +1,158 @@
+"""
+Willow Neo4j MCP Server - Cypher Result Cache
+TTL + LRU cache for read-only query results, dropped whenever a write goes through the server
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+CYPHER_CACHE_TTL = float(os.getenv("CYPHER_CACHE_TTL", "60"))
+CYPHER_CACHE_MAX_ENTRIES = int(os.getenv("CYPHER_CACHE_MAX_ENTRIES", "1024"))
+CYPHER_CACHE_MAX_BYTES = int(os.getenv("CYPHER_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# One token of query text: a string literal or backtick identifier (kept verbatim),
+# a comment, a run of whitespace, or anything else up to the next of those
+_TOKEN = re.compile(
+    r"""'(?:[^'\\]|\\.)*'?"""
+    r"""|"(?:[^"\\]|\\.)*"?"""
+    r"|`(?:[^`]|``)*`?"
+    r"|//[^\n]*|/\*.*?(?:\*/|$)"
+    r"|\s+"
+    r"""|[^'"`/\s]+|/""",
+    re.DOTALL
+)
+
+
+@dataclass
+class _Entry:
+    records: List[dict]
+    size: int
+    expires_at: float
+
+
+def fingerprint(query: str) -> str:
+    """
+    Query text with comments and formatting removed, so reformatted copies share an entry
+
+    String literals and backtick identifiers are copied as they are - a "//" in
+    'http://...' is not a comment, and 'a  b' is not the same value as 'a b'.
+    """
+    parts = []
+    for token in _TOKEN.findall(query):
+        if token[0] in "'\"`":
+            parts.append(token)
+        elif token.startswith("//") or token.startswith("/*") or token.isspace():
+            if parts and parts[-1] != " ":
+                parts.append(" ")
+        else:
+            parts.append(token)
+    return "".join(parts).strip()
+
+
+def strip_literals(query: str) -> str:
+    """
+    Query text with the contents of string literals and backtick identifiers
+    emptied and comments turned into spaces, for checks that should only see
+    Cypher syntax - '[*]' in a string or a comment is not a pattern
+    """
+    parts = []
+    for token in _TOKEN.findall(query):
+        if token[0] in "'\"`":
+            parts.append(token[0] * 2)
+        elif token.startswith("//") or token.startswith("/*"):
+            parts.append(" ")
+        else:
+            parts.append(token)
+    return "".join(parts)
+
+
+def cache_key(query: str, parameters: Optional[Dict[str, Any]]) -> str:
+    payload = json.dumps([fingerprint(query), parameters or {}], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class CypherCache:
+    """
+    Results of read-only queries keyed by query fingerprint and parameters
+
+    Opt-in per request. Bounded by entry count and by the approximate JSON size
+    of the cached records; least recently used entries go first. The server
+    can't tell which labels a write touched, so any write clears the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CYPHER_CACHE_MAX_ENTRIES,
+        max_bytes: int = CYPHER_CACHE_MAX_BYTES
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Write counter - run_cypher reads it before querying and put() refuses records from an older one
+        self.generation = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Returns (hit, records)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry.records
+
+    def put(self, key: str, records: List[dict], generation: int, ttl: float = CYPHER_CACHE_TTL):
+        """Store records read while the cache was at `generation` (skipped if a write happened since)"""
+        size = len(json.dumps(records, default=str))
+        with self._lock:
+            if generation != self.generation or size > self.max_bytes:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(records=records, size=size, expires_at=time.monotonic() + ttl)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str):
+        self._bytes -= self._entries.pop(key).size
+
+    def invalidate(self) -> int:
+        """Drop every cached result. Returns how many were dropped."""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            self.invalidations += count
+            self.generation += 1
+            return count
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "invalidations": self.invalidations
+            }
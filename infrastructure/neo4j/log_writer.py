@@ -0,0 +1,155 @@
+"""
+Willow Neo4j MCP Server - Execution Log Writer
+Buffers :ExecutionLog entries in memory and writes them in batches off the request path
+"""
+
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+LOG_BATCH_SIZE = int(os.getenv("EXECUTION_LOG_BATCH_SIZE", "100"))
+LOG_FLUSH_INTERVAL = float(os.getenv("EXECUTION_LOG_FLUSH_INTERVAL", "2"))
+LOG_QUEUE_SIZE = int(os.getenv("EXECUTION_LOG_QUEUE_SIZE", "10000"))
+# What to do when the queue is full: "drop_newest" discards the incoming entry,
+# "drop_oldest" discards the oldest buffered one to make room
+LOG_OVERFLOW_POLICY = os.getenv("EXECUTION_LOG_OVERFLOW_POLICY", "drop_newest")
+
+LOG_BATCH_QUERY = """
+UNWIND $entries AS entry
+CREATE (log:ExecutionLog {
+    query: entry.query,
+    parameters: entry.parameters,
+    result_count: entry.result_count,
+    duration_ms: entry.duration_ms,
+    available_after_ms: entry.available_after_ms,
+    consumed_after_ms: entry.consumed_after_ms,
+    executed_at: datetime(entry.executed_at),
+    executed_by: 'claude-mcp'
+})
+"""
+
+
+class ExecutionLogWriter:
+    """
+    Background writer for :ExecutionLog nodes
+
+    Requests only enqueue an entry; an asyncio task drains the queue and writes
+    every LOG_BATCH_SIZE entries (or every LOG_FLUSH_INTERVAL seconds, whichever
+    comes first) with a single UNWIND. The queue is bounded so a slow or
+    unreachable database can't grow memory without limit - overflow is dropped
+    according to LOG_OVERFLOW_POLICY and counted. stop() flushes what's left.
+    """
+
+    def __init__(self, get_driver: Callable):
+        if LOG_OVERFLOW_POLICY not in ("drop_newest", "drop_oldest"):
+            raise ValueError(
+                f"Unknown EXECUTION_LOG_OVERFLOW_POLICY '{LOG_OVERFLOW_POLICY}' "
+                "(expected 'drop_newest' or 'drop_oldest')"
+            )
+        self.get_driver = get_driver
+        self._queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=LOG_QUEUE_SIZE)
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+        self.failed_batches = 0
+
+    def log(
+        self,
+        query: str,
+        parameters: dict,
+        result_count: int,
+        duration_ms: Optional[float] = None,
+        available_after_ms: Optional[int] = None,
+        consumed_after_ms: Optional[int] = None
+    ):
+        """Queue one execution for logging (never blocks the request - call from the event loop)"""
+        entry = {
+            "query": query,
+            "parameters": json.dumps(parameters, default=str),
+            "result_count": result_count,
+            "duration_ms": duration_ms,
+            "available_after_ms": available_after_ms,
+            "consumed_after_ms": consumed_after_ms,
+            "executed_at": datetime.now(timezone.utc).isoformat()
+        }
+        try:
+            self._queue.put_nowait(entry)
+            return
+        except asyncio.QueueFull:
+            if LOG_OVERFLOW_POLICY == "drop_newest":
+                self.dropped += 1
+                return
+
+        try:
+            self._queue.get_nowait()
+            self.dropped += 1
+        except asyncio.QueueEmpty:
+            pass
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _take_batch(self, deadline: float) -> List[Dict[str, Any]]:
+        """Collect up to LOG_BATCH_SIZE entries, waiting no later than deadline"""
+        batch: List[Dict[str, Any]] = []
+        while len(batch) < LOG_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+        return batch
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            batch = await self._take_batch(time.monotonic() + LOG_FLUSH_INTERVAL)
+            if batch:
+                await self._write(batch)
+
+    async def _write(self, batch: List[Dict[str, Any]]):
+        try:
+            async with self.get_driver().session() as session:
+                result = await session.run(LOG_BATCH_QUERY, {"entries": batch})
+                await result.consume()
+            self.written += len(batch)
+        except Exception as e:
+            self.failed_batches += 1
+            print(f"Failed to write {len(batch)} execution logs: {e}")
+
+    async def flush(self):
+        """Write everything currently buffered"""
+        while True:
+            batch = await self._take_batch(time.monotonic())
+            if not batch:
+                return
+            await self._write(batch)
+
+    async def stop(self):
+        """Stop the background task and flush what's left (called from the shutdown hook)"""
+        # Let an in-progress batch finish rather than cancelling it mid-write
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed_batches": self.failed_batches,
+            "overflow_policy": LOG_OVERFLOW_POLICY
+        }
@@ -0,0 +1,167 @@
+"""
+Willow Neo4j MCP Server - Query Guard
+Admission control for run_cypher: budgets checked against the EXPLAIN plan before anything runs
+"""
+
+import os
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from cypher_cache import strip_literals
+from query_routing import QueryPlan
+
+QUERY_GUARD_ENABLED = os.getenv("QUERY_GUARD_ENABLED", "true").lower() == "true"
+# Default server-side transaction timeout for run_cypher queries (seconds)
+QUERY_TIMEOUT = float(os.getenv("QUERY_TIMEOUT", "30"))
+# Over the soft budget a query still runs, but with the shorter downgrade timeout
+QUERY_GUARD_SOFT_ROWS = float(os.getenv("QUERY_GUARD_SOFT_ROWS", "100000"))
+QUERY_GUARD_MAX_ROWS = float(os.getenv("QUERY_GUARD_MAX_ROWS", "10000000"))
+QUERY_GUARD_DOWNGRADE_TIMEOUT = float(os.getenv("QUERY_GUARD_DOWNGRADE_TIMEOUT", "5"))
+# Plan operators that downgrade a query / reject it outright
+QUERY_GUARD_DOWNGRADE_OPERATORS = frozenset(
+    op.strip() for op in os.getenv("QUERY_GUARD_DOWNGRADE_OPERATORS", "AllNodesScan").split(",") if op.strip()
+)
+QUERY_GUARD_REJECT_OPERATORS = frozenset(
+    op.strip() for op in os.getenv("QUERY_GUARD_REJECT_OPERATORS", "CartesianProduct").split(",") if op.strip()
+)
+QUERY_GUARD_REJECT_UNBOUNDED = os.getenv("QUERY_GUARD_REJECT_UNBOUNDED", "true").lower() == "true"
+
+# [*], [:REL*], [*2..], [*..] - variable-length relationships without an upper bound
+_UNBOUNDED_VAR_LENGTH = re.compile(r"\[[^\[\]]*\*\s*(?:\d+\s*\.\.\s*|\.\.\s*)?\]")
+# {1, *}, {1,}, {,} - path quantifiers without an upper bound, as plans describe them
+_UNBOUNDED_QUANTIFIER = re.compile(r"\{\s*\d*\s*,\s*\*?\s*\}")
+# The same in query text, plus the + and * shorthands: ((a)-[:R]->(b)){2,}, (a)-[:R]->+(b)
+_UNBOUNDED_QUANTIFIED_PATTERN = re.compile(r"\)\s*\{\s*\d*\s*,\s*\}|[)>-]\s*[+*]\s*\(")
+# Shortest-path searches stop at the first match, so an open upper bound is expected inside them
+_SHORTEST_PATH = re.compile(r"\b(?:shortestPath|allShortestPaths)\s*\(", re.IGNORECASE)
+
+
+class QueryRejectedError(ValueError):
+    """Raised when a query exceeds the guard's budgets"""
+
+
+@dataclass
+class Admission:
+    """How a query may run"""
+    timeout: float = QUERY_TIMEOUT
+    downgraded: bool = False
+    reasons: List[str] = field(default_factory=list)
+
+
+def _outside_shortest_paths(text: str) -> str:
+    """text with the pattern inside every shortestPath(...) / allShortestPaths(...) call cut out"""
+    parts = []
+    position = 0
+    for match in _SHORTEST_PATH.finditer(text):
+        if match.start() < position:
+            continue
+        parts.append(text[position:match.end()])
+        depth, position = 1, match.end()
+        while position < len(text) and depth:
+            depth += {"(": 1, ")": -1}.get(text[position], 0)
+            position += 1
+        parts.append(")")
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def unbounded_in_text(query: str) -> bool:
+    """Whether the query text has an unbounded variable-length or quantified pattern outside a shortest path"""
+    text = _outside_shortest_paths(strip_literals(query))
+    return bool(_UNBOUNDED_VAR_LENGTH.search(text) or _UNBOUNDED_QUANTIFIED_PATTERN.search(text))
+
+
+def unbounded_expansions(query: str, plan: QueryPlan) -> List[str]:
+    """
+    The plan's variable-length and quantified expansions that have no upper bound
+
+    Read from each expansion operator's details (e.g. (a)-[anon_0*]->(b), or
+    {1, *} on a Repeat), so patterns in strings and comments don't count and a
+    shortestPath(...) only covers its own pattern. A server that doesn't
+    describe its operators falls back to the query text.
+    """
+    unbounded = []
+    for operator, details in plan.expansions:
+        if not details:
+            if unbounded_in_text(query):
+                unbounded.append(operator)
+            continue
+        details = strip_literals(details)
+        if _UNBOUNDED_VAR_LENGTH.search(details) or _UNBOUNDED_QUANTIFIER.search(details):
+            unbounded.append(details)
+    return unbounded
+
+
+class QueryGuard:
+    """
+    Checks a query's EXPLAIN plan against configurable budgets
+
+    Rejected: estimated rows over QUERY_GUARD_MAX_ROWS, any operator in
+    QUERY_GUARD_REJECT_OPERATORS (cartesian products by default), or a
+    variable-length or quantified expansion in the plan with no upper bound.
+    Downgraded: estimated rows over QUERY_GUARD_SOFT_ROWS or an operator in
+    QUERY_GUARD_DOWNGRADE_OPERATORS (AllNodesScan by default) - these still run,
+    but under QUERY_GUARD_DOWNGRADE_TIMEOUT instead of QUERY_TIMEOUT.
+    Rejections are printed and kept for /admin/query_guard.
+    """
+
+    def __init__(self):
+        self.admitted = 0
+        self.downgraded = 0
+        self.rejected = 0
+        self.recent_rejections: Deque[Dict[str, Any]] = deque(maxlen=50)
+
+    def check(self, query: str, plan: Optional[QueryPlan]) -> Admission:
+        """
+        Decide how a query may run
+
+        Raises:
+            QueryRejectedError: if the query is over a hard budget
+        """
+        if not QUERY_GUARD_ENABLED or plan is None:
+            return Admission()
+
+        rejections = []
+        if plan.estimated_rows > QUERY_GUARD_MAX_ROWS:
+            rejections.append(f"estimated {plan.estimated_rows:,.0f} rows exceeds {QUERY_GUARD_MAX_ROWS:,.0f}")
+        for operator in sorted(plan.operators & QUERY_GUARD_REJECT_OPERATORS):
+            rejections.append(f"plan uses {operator}")
+        unbounded = unbounded_expansions(query, plan) if QUERY_GUARD_REJECT_UNBOUNDED else []
+        if unbounded:
+            rejections.append(
+                f"variable-length pattern without an upper bound: {', '.join(unbounded)} (e.g. use [*..5] or {{1,5}})"
+            )
+
+        if rejections:
+            self.rejected += 1
+            self.recent_rejections.append({"query": query, "reasons": rejections, "at": time.time()})
+            print(f"Rejected query ({'; '.join(rejections)}): {query[:200]}")
+            raise QueryRejectedError(f"Query rejected by cost guard: {'; '.join(rejections)}")
+
+        admission = Admission()
+        if plan.estimated_rows > QUERY_GUARD_SOFT_ROWS:
+            admission.reasons.append(f"estimated {plan.estimated_rows:,.0f} rows exceeds {QUERY_GUARD_SOFT_ROWS:,.0f}")
+        for operator in sorted(plan.operators & QUERY_GUARD_DOWNGRADE_OPERATORS):
+            admission.reasons.append(f"plan uses {operator}")
+
+        if admission.reasons:
+            admission.downgraded = True
+            admission.timeout = min(QUERY_GUARD_DOWNGRADE_TIMEOUT, QUERY_TIMEOUT)
+            self.downgraded += 1
+        else:
+            self.admitted += 1
+        return admission
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": QUERY_GUARD_ENABLED,
+            "admitted": self.admitted,
+            "downgraded": self.downgraded,
+            "rejected": self.rejected,
+            "timeout": QUERY_TIMEOUT,
+            "downgrade_timeout": QUERY_GUARD_DOWNGRADE_TIMEOUT,
+            "recent_rejections": list(self.recent_rejections)
+        }
@@ -0,0 +1,217 @@
+"""
+Willow Neo4j MCP Server - Query Routing
+Classifies Cypher as read or write and runs it in the matching managed transaction
+"""
+
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from neo4j import Query, unit_of_work
+
+QUERY_PLAN_CACHE_SIZE = int(os.getenv("QUERY_PLAN_CACHE_SIZE", "1024"))
+
+READ = "read"
+WRITE = "write"
+# Queries that manage their own transactions can't run inside execute_read/execute_write
+AUTO_COMMIT = "auto"
+QUERY_MODES = (READ, WRITE, AUTO_COMMIT)
+
+_AUTO_COMMIT_QUERY = re.compile(r"\bIN\s+TRANSACTIONS\b|\bPERIODIC\s+COMMIT\b|^\s*(EXPLAIN|PROFILE)\b", re.IGNORECASE)
+_PLAN_PREFIX = re.compile(r"^\s*(EXPLAIN|PROFILE)\b", re.IGNORECASE)
+
+
+# Plan operators that expand a variable number of hops. Shortest-path operators
+# (ShortestPath, StatefulShortestPath) stop at the first match and aren't among them.
+EXPANSION_OPERATORS = ("VarLengthExpand", "PruningVarExpand", "BFSPruningVarExpand", "Repeat")
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """What an EXPLAIN of a query told us"""
+    mode: str
+    operators: FrozenSet[str]
+    estimated_rows: float
+    # (operator, details) for every variable-length or quantified expansion in the plan
+    expansions: Tuple[Tuple[str, str], ...] = ()
+
+
+# Update counters reported per statement by run_batch (zeros are left out)
+COUNTER_NAMES = (
+    "nodes_created", "nodes_deleted", "relationships_created", "relationships_deleted",
+    "properties_set", "labels_added", "labels_removed", "indexes_added", "indexes_removed",
+    "constraints_added", "constraints_removed"
+)
+
+
+class BatchStatementError(Exception):
+    """A statement in a batch failed - its chunk was rolled back, earlier chunks stay committed"""
+
+    def __init__(self, index: int, committed: List[dict], cause: Exception):
+        super().__init__(f"Statement {index} failed: {cause}")
+        self.index = index
+        self.committed = committed
+        self.cause = cause
+
+
+def is_auto_commit(query: str) -> bool:
+    """Whether a query manages its own transactions (CALL ... IN TRANSACTIONS, EXPLAIN/PROFILE) - no round trip"""
+    return bool(_AUTO_COMMIT_QUERY.search(query))
+
+
+# Query text -> plan, so each distinct query is only EXPLAINed once
+_plans: "OrderedDict[str, QueryPlan]" = OrderedDict()
+
+
+def _walk(plan: Dict[str, Any], operators: set, expansions: list) -> float:
+    """Collect operator names (without the @runtime suffix) and expansion details, and return the largest row estimate"""
+    operator = plan.get("operatorType", "").split("@")[0]
+    operators.add(operator)
+    args = plan.get("args", plan.get("arguments", {}))
+    if operator.startswith(EXPANSION_OPERATORS):
+        expansions.append((operator, str(args.get("Details", "") or "")))
+    estimated = float(args.get("EstimatedRows", 0) or 0)
+    for child in plan.get("children", []):
+        estimated = max(estimated, _walk(child, operators, expansions))
+    return estimated
+
+
+async def explain(session, query: str, parameters: Optional[Dict[str, Any]] = None) -> QueryPlan:
+    """
+    EXPLAIN a query (plans without executing) and remember the result
+
+    The query type Neo4j reports gives the mode ("r" is read-only; "rw", "w"
+    and "s" all need a write transaction), and the plan gives the operators
+    and row estimates the query guard budgets against. Costs one round trip
+    the first time a query is seen and nothing after that.
+    """
+    plan = _plans.get(query)
+    if plan is not None:
+        _plans.move_to_end(query)
+        return plan
+
+    result = await session.run(f"EXPLAIN {_PLAN_PREFIX.sub('', query)}", parameters or {})
+    summary = await result.consume()
+
+    operators: set = set()
+    expansions: list = []
+    estimated_rows = _walk(summary.plan, operators, expansions) if summary.plan else 0.0
+    if is_auto_commit(query):
+        mode = AUTO_COMMIT
+    else:
+        mode = READ if summary.query_type == "r" else WRITE
+    plan = QueryPlan(
+        mode=mode,
+        operators=frozenset(operators),
+        estimated_rows=estimated_rows,
+        expansions=tuple(expansions)
+    )
+
+    _plans[query] = plan
+    while len(_plans) > QUERY_PLAN_CACHE_SIZE:
+        _plans.popitem(last=False)
+    return plan
+
+
+async def classify(session, query: str, parameters: Optional[Dict[str, Any]] = None) -> str:
+    """Work out whether a query only reads (READ, WRITE or AUTO_COMMIT)"""
+    if is_auto_commit(query):
+        return AUTO_COMMIT
+    return (await explain(session, query, parameters)).mode
+
+
+async def _collect(tx, query: str, parameters: Dict[str, Any]) -> Tuple[List[dict], Any]:
+    result = await tx.run(query, parameters)
+    records = [dict(record) async for record in result]
+    return records, await result.consume()
+
+
+async def run_query(
+    session,
+    query: str,
+    parameters: Optional[Dict[str, Any]] = None,
+    mode: Optional[str] = None,
+    timeout: Optional[float] = None
+) -> Tuple[List[dict], Any]:
+    """
+    Run a query in a managed transaction chosen by its mode
+
+    Reads go through execute_read (routable to cluster readers), writes through
+    execute_write. Both retry transient errors - leader switches, deadlocks,
+    dropped connections during an AuraDB failover - for up to the driver's
+    max_transaction_retry_time. AUTO_COMMIT queries run once with session.run.
+
+    Args:
+        mode: READ, WRITE or AUTO_COMMIT - None to classify with EXPLAIN
+        timeout: Server-side transaction timeout in seconds (None for the database default)
+
+    Returns:
+        (records, result summary) - the summary carries result_available_after / result_consumed_after
+    """
+    parameters = parameters or {}
+    if mode is None:
+        mode = await classify(session, query, parameters)
+
+    if mode in (READ, WRITE):
+        work = unit_of_work(timeout=timeout)(_collect) if timeout else _collect
+        if mode == READ:
+            return await session.execute_read(work, query, parameters)
+        return await session.execute_write(work, query, parameters)
+
+    result = await session.run(Query(query, timeout=timeout), parameters)
+    records = [dict(record) async for record in result]
+    return records, await result.consume()
+
+
+async def _run_statements(tx, statements: List[Tuple[int, str, Dict[str, Any]]], current: List[int]) -> List[dict]:
+    results = []
+    for index, query, parameters in statements:
+        current[0] = index
+        started = time.perf_counter()
+        result = await tx.run(query, parameters)
+        records = [dict(record) async for record in result]
+        summary = await result.consume()
+        results.append({
+            "index": index,
+            "records": records,
+            "summary": summary,
+            "duration_ms": (time.perf_counter() - started) * 1000
+        })
+    return results
+
+
+async def run_batch(
+    session,
+    statements: List[Tuple[str, Dict[str, Any]]],
+    chunk_size: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> List[dict]:
+    """
+    Run statements in order inside write transactions
+
+    With no chunk_size everything is one transaction, so a failure rolls the
+    whole batch back. With chunk_size each chunk commits on its own and a
+    failure only rolls back the chunk it happened in. Each transaction is
+    retried on transient errors like any execute_write.
+
+    Returns:
+        One dict per statement: index, records, summary (the driver's ResultSummary), duration_ms
+
+    Raises:
+        BatchStatementError: carrying the failed statement's index and the results already committed
+    """
+    numbered = [(index, query, parameters or {}) for index, (query, parameters) in enumerate(statements)]
+    size = chunk_size or len(numbered) or 1
+    work = unit_of_work(timeout=timeout)(_run_statements) if timeout else _run_statements
+
+    committed: List[dict] = []
+    for start in range(0, len(numbered), size):
+        current = [start]
+        try:
+            committed.extend(await session.execute_write(work, numbered[start:start + size], current))
+        except Exception as e:
+            raise BatchStatementError(current[0], committed, e) from e
+    return committed
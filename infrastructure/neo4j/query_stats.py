@@ -0,0 +1,178 @@
+"""
+Willow Neo4j MCP Server - Query Stats
+Per-fingerprint timing aggregates and PROFILE runs for slow read queries
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from neo4j import unit_of_work
+
+from cypher_cache import fingerprint
+from query_guard import QUERY_TIMEOUT
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "1000"))
+# Off by default: PROFILE executes the query a second time
+SLOW_QUERY_PROFILE = os.getenv("SLOW_QUERY_PROFILE", "false").lower() == "true"
+# Re-profile the same slow query at most this often (seconds)
+SLOW_QUERY_PROFILE_INTERVAL = float(os.getenv("SLOW_QUERY_PROFILE_INTERVAL", "300"))
+QUERY_STATS_MAX_FINGERPRINTS = int(os.getenv("QUERY_STATS_MAX_FINGERPRINTS", "2000"))
+
+SORT_KEYS = ("total_ms", "mean_ms", "max_ms", "count", "errors", "rows")
+
+
+@dataclass
+class _Aggregate:
+    fingerprint: str
+    count: int = 0
+    errors: int = 0
+    slow: int = 0
+    rows: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    available_after_ms: float = 0.0
+    consumed_after_ms: float = 0.0
+    last_seen: float = 0.0
+    profile: Optional[Dict[str, Any]] = None
+    profiled_at: float = 0.0
+
+    def describe(self) -> dict:
+        timed = self.count - self.errors
+        return {
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "errors": self.errors,
+            "slow": self.slow,
+            "rows": self.rows,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "mean_available_after_ms": round(self.available_after_ms / timed, 3) if timed else None,
+            "mean_consumed_after_ms": round(self.consumed_after_ms / timed, 3) if timed else None,
+            "last_seen": self.last_seen,
+            "profile": self.profile
+        }
+
+
+def _profile_summary(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Total db hits and the operators that cost the most, from a PROFILE plan"""
+    operators: List[Dict[str, Any]] = []
+
+    def walk(node: Dict[str, Any]):
+        operators.append({
+            "operator": node.get("operatorType", "").split("@")[0],
+            "db_hits": node.get("dbHits", 0),
+            "rows": node.get("rows", 0)
+        })
+        for child in node.get("children", []):
+            walk(child)
+
+    walk(plan)
+    return {
+        "db_hits": sum(op["db_hits"] for op in operators),
+        "top_operators": sorted(operators, key=lambda op: op["db_hits"], reverse=True)[:5]
+    }
+
+
+class QueryStats:
+    """
+    Timing for every query the server runs, aggregated by query fingerprint
+
+    Each execution records wall time (including driver retries) plus the
+    server's result_available_after / result_consumed_after. With
+    SLOW_QUERY_PROFILE on, a read slower than SLOW_QUERY_MS is re-run once under
+    PROFILE in the background (at most every SLOW_QUERY_PROFILE_INTERVAL per
+    fingerprint, under the same transaction timeout as the original run) to
+    capture db hits. Writes are never profiled - PROFILE executes the query.
+    """
+
+    def __init__(self, get_driver: Callable):
+        self.get_driver = get_driver
+        self._aggregates: Dict[str, _Aggregate] = {}
+        self._profiling: set = set()
+        # The event loop only holds weak references to tasks - these keep PROFILE runs alive until they finish
+        self._tasks: set = set()
+
+    def _aggregate(self, query: str) -> _Aggregate:
+        key = fingerprint(query)
+        aggregate = self._aggregates.get(key)
+        if aggregate is None:
+            if len(self._aggregates) >= QUERY_STATS_MAX_FINGERPRINTS:
+                # Forget the fingerprint seen longest ago
+                del self._aggregates[min(self._aggregates.values(), key=lambda a: a.last_seen).fingerprint]
+            aggregate = self._aggregates[key] = _Aggregate(fingerprint=key)
+        return aggregate
+
+    def record(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        duration_ms: float,
+        rows: int = 0,
+        summary: Any = None,
+        error: bool = False,
+        read: bool = False,
+        timeout: Optional[float] = None
+    ):
+        aggregate = self._aggregate(query)
+        aggregate.count += 1
+        aggregate.total_ms += duration_ms
+        aggregate.max_ms = max(aggregate.max_ms, duration_ms)
+        aggregate.last_seen = time.time()
+
+        if error:
+            aggregate.errors += 1
+            return
+
+        aggregate.rows += rows
+        if summary is not None:
+            aggregate.available_after_ms += summary.result_available_after or 0
+            aggregate.consumed_after_ms += summary.result_consumed_after or 0
+
+        if duration_ms >= SLOW_QUERY_MS:
+            aggregate.slow += 1
+            print(f"Slow query ({duration_ms:.0f}ms): {aggregate.fingerprint[:200]}")
+            if (SLOW_QUERY_PROFILE and read and aggregate.fingerprint not in self._profiling
+                    and time.time() - aggregate.profiled_at > SLOW_QUERY_PROFILE_INTERVAL):
+                self._profiling.add(aggregate.fingerprint)
+                task = asyncio.create_task(self._profile(aggregate, query, parameters or {}, timeout))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _profile(
+        self,
+        aggregate: _Aggregate,
+        query: str,
+        parameters: Dict[str, Any],
+        timeout: Optional[float] = None
+    ):
+        # Same budget the original run had (QUERY_TIMEOUT if it ran without one)
+        @unit_of_work(timeout=timeout or QUERY_TIMEOUT)
+        async def work(tx):
+            result = await tx.run(f"PROFILE {query}", parameters)
+            return await result.consume()
+
+        try:
+            async with self.get_driver().session() as session:
+                summary = await session.execute_read(work)
+            if summary.profile:
+                aggregate.profile = _profile_summary(summary.profile)
+        except Exception as e:
+            print(f"Failed to profile slow query: {e}")
+        finally:
+            aggregate.profiled_at = time.time()
+            self._profiling.discard(aggregate.fingerprint)
+
+    def top(self, sort: str = "total_ms", limit: int = 20) -> List[dict]:
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort '{sort}' (expected one of {', '.join(SORT_KEYS)})")
+        rows = [aggregate.describe() for aggregate in list(self._aggregates.values())]
+        return sorted(rows, key=lambda row: row[sort] or 0, reverse=True)[:limit]
+
+    def clear(self) -> int:
+        count = len(self._aggregates)
+        self._aggregates.clear()
+        return count
@@ -5,29 +5,62 @@ Exposes Neo4j graph operations as MCP tools for Claude
 
 import os
 import json
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 from fastapi import FastAPI, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from neo4j import GraphDatabase
+from neo4j import READ_ACCESS, WRITE_ACCESS, AsyncGraphDatabase, Query
 import uvicorn
 
+from cursors import CURSOR_MAX_PAGE_SIZE, Cursor, CursorError, CursorRegistry
+from cypher_cache import CYPHER_CACHE_TTL, CypherCache, cache_key
+from log_writer import ExecutionLogWriter
+from query_guard import QUERY_GUARD_ENABLED, QUERY_TIMEOUT, Admission, QueryGuard
+from query_routing import (
+    COUNTER_NAMES, QUERY_MODES, READ, BatchStatementError, classify, explain, is_auto_commit, run_batch, run_query
+)
+from query_stats import SORT_KEYS, QueryStats
+from skill_catalog import SkillCatalog, touches_skills
+from willow_client import WillowApiClient
+
 # Environment configuration
 NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "willowdev123")
 MCP_PORT = int(os.getenv("MCP_PORT", "3001"))
+# Connection pool shared by every in-flight request; a request waits up to the
+# acquisition timeout for a free connection before failing
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+NEO4J_ACQUISITION_TIMEOUT = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "30"))
+NEO4J_CONNECTION_TIMEOUT = float(os.getenv("NEO4J_CONNECTION_TIMEOUT", "15"))
+# How long managed transactions keep retrying transient errors (e.g. during a failover)
+NEO4J_MAX_RETRY_TIME = float(os.getenv("NEO4J_MAX_RETRY_TIME", "30"))
+# Records pulled per round trip when streaming results
+NEO4J_FETCH_SIZE = int(os.getenv("NEO4J_FETCH_SIZE", "500"))
+# Largest number of statements accepted by /tools/run_cypher_batch
+CYPHER_BATCH_MAX_STATEMENTS = int(os.getenv("CYPHER_BATCH_MAX_STATEMENTS", "1000"))
 
 # Initialize FastAPI app
 app = FastAPI(title="Willow Neo4j MCP Server", version="0.1.0")
 
-# Neo4j driver
+# Neo4j driver (async - requests share the event loop instead of each holding a thread)
 driver = None
 
 def get_driver():
     global driver
     if driver is None:
-        driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+        driver = AsyncGraphDatabase.driver(
+            NEO4J_URI,
+            auth=(NEO4J_USER, NEO4J_PASSWORD),
+            max_connection_pool_size=NEO4J_MAX_POOL_SIZE,
+            connection_acquisition_timeout=NEO4J_ACQUISITION_TIMEOUT,
+            connection_timeout=NEO4J_CONNECTION_TIMEOUT,
+            max_transaction_retry_time=NEO4J_MAX_RETRY_TIME
+        )
     return driver
 
 # Pydantic models for request/response
@@ -35,6 +68,24 @@ class CypherRequest(BaseModel):
     query: str
     parameters: Optional[Dict[str, Any]] = {}
     log_execution: bool = True
+    mode: Optional[str] = None  # "read", "write" or "auto" (auto-commit); classified with EXPLAIN if not set
+    cache: bool = False  # serve/store read-only results from the result cache
+    cache_ttl: Optional[float] = None  # seconds, defaults to CYPHER_CACHE_TTL
+    page_size: Optional[int] = None  # return the first page of a read and a next_cursor for the rest
+    stream: bool = False  # stream records as NDJSON as the driver yields them
+
+class BatchStatement(BaseModel):
+    query: str
+    parameters: Optional[Dict[str, Any]] = {}
+
+class CypherBatchRequest(BaseModel):
+    statements: List[BatchStatement]
+    chunk_size: Optional[int] = None  # statements per transaction; None runs the whole batch in one
+    log_execution: bool = True
+
+class CursorRequest(BaseModel):
+    cursor: str
+    page_size: int = 100
 
 class SkillExecutionRequest(BaseModel):
     name: str
@@ -44,133 +95,399 @@ class Response(BaseModel):
     success: bool
     data: Optional[Any] = None
     error: Optional[str] = None
+    cache: Optional[str] = None  # "hit" / "miss" when the request asked for caching, "bypass" for writes
+    next_cursor: Optional[str] = None  # pass to /tools/fetch_page for the next page, None on the last page
+    notices: Optional[List[str]] = None  # why the query guard downgraded the query, if it did
 
-# Helper to log executions to graph
-def log_query_execution(query: str, parameters: dict, result_count: int):
-    """Log query execution as :ExecutionLog node in graph"""
+# ExecutionLog nodes are buffered and written in batches by a background task
+log_writer = ExecutionLogWriter(get_driver)
+
+# Read-only query results, opt-in per run_cypher request and cleared by any write
+cypher_cache = CypherCache()
+
+# Every :Skill node, kept in memory for get_skills / execute_skill
+skill_catalog = SkillCatalog(get_driver)
+
+# Python skills run in willow-api, reached over a pooled keep-alive HTTP client
+willow_api = WillowApiClient()
+
+def after_write(query: str):
+    """Drop cached state a write may have made stale"""
+    cypher_cache.invalidate()
+    if touches_skills(query):
+        skill_catalog.request_refresh()
+
+# EXPLAIN-based admission control for agent-supplied Cypher
+query_guard = QueryGuard()
+
+# Timing per query fingerprint, with PROFILE runs for slow reads
+query_stats = QueryStats(get_driver)
+
+async def admit(session, request: "CypherRequest") -> Tuple[str, Admission]:
+    """
+    Classify a run_cypher query and check it against the cost guard (one cached EXPLAIN covers both)
+
+    Returns:
+        (mode, admission) - raises QueryRejectedError if the query is over budget
+    """
+    plan = None
+    if QUERY_GUARD_ENABLED or request.mode is None:
+        plan = await explain(session, request.query, request.parameters)
+    return request.mode or plan.mode, query_guard.check(request.query, plan)
+
+async def execute_query(
+    session,
+    query: str,
+    parameters: Optional[dict] = None,
+    mode: Optional[str] = None,
+    timeout: Optional[float] = None,
+    log_execution: bool = True
+):
+    """
+    Run a query in the transaction type its mode calls for, clearing the result cache after writes
+
+    Every run is timed into query_stats and (unless log_execution is False)
+    logged as an :ExecutionLog with its duration.
+
+    Returns:
+        (records, mode)
+    """
+    mode = mode or await classify(session, query, parameters)
+    started = time.perf_counter()
     try:
-        log_query = """
-        CREATE (log:ExecutionLog {
-            query: $query,
-            parameters: $parameters,
-            result_count: $result_count,
-            executed_at: datetime(),
-            executed_by: 'claude-mcp'
-        })
-        RETURN log
-        """
-        with get_driver().session() as session:
-            session.run(log_query, {
-                "query": query,
-                "parameters": json.dumps(parameters),
-                "result_count": result_count
-            })
-    except Exception as e:
-        print(f"Failed to log execution: {e}")
+        records, summary = await run_query(session, query, parameters, mode, timeout)
+    except Exception:
+        query_stats.record(query, parameters, (time.perf_counter() - started) * 1000, error=True)
+        raise
+    finally:
+        # Auto-commit batches (CALL ... IN TRANSACTIONS) can partially land even when they fail
+        if mode != READ:
+            after_write(query)
+
+    duration_ms = (time.perf_counter() - started) * 1000
+    query_stats.record(query, parameters, duration_ms, len(records), summary, read=mode == READ, timeout=timeout)
+    if log_execution:
+        log_query_execution(query, parameters, len(records), duration_ms, summary)
+    return records, mode
+
+def record_cursor(cursor: Cursor):
+    """Time and log a paginated read once its cursor closes (wall time includes the caller's paging)"""
+    duration_ms = (time.perf_counter() - cursor.opened_at) * 1000
+    query_stats.record(
+        cursor.query, cursor.parameters, duration_ms, cursor.fetched, cursor.summary,
+        error=cursor.failed, read=True, timeout=cursor.timeout
+    )
+    log_query_execution(cursor.query, cursor.parameters, cursor.fetched, duration_ms, cursor.summary)
+
+# Open results paged through by /tools/fetch_page; timed and logged once when each cursor closes
+cursors = CursorRegistry(on_close=record_cursor)
+
+# Helper to log executions to graph
+def log_query_execution(
+    query: str,
+    parameters: dict,
+    result_count: int,
+    duration_ms: Optional[float] = None,
+    summary: Any = None
+):
+    """Queue query execution to be logged as :ExecutionLog node in graph"""
+    log_writer.log(
+        query,
+        parameters,
+        result_count,
+        round(duration_ms, 3) if duration_ms is not None else None,
+        summary.result_available_after if summary is not None else None,
+        summary.result_consumed_after if summary is not None else None
+    )
 
 @app.get("/")
 def root():
     return {"service": "Willow Neo4j MCP Server", "status": "running", "version": "0.1.0"}
 
 @app.get("/health")
-def health_check():
+async def health_check():
     """Health check endpoint"""
+    components = {
+        "execution_log": log_writer.stats(),
+        "cursors": cursors.stats(),
+        "skill_catalog": skill_catalog.stats()
+    }
     try:
-        with get_driver().session() as session:
-            result = session.run("RETURN 1 as num")
-            result.single()
-        return {"status": "healthy", "neo4j": "connected"}
+        async with get_driver().session() as session:
+            result = await session.run("RETURN 1 as num")
+            await result.single()
+        return {"status": "healthy", "neo4j": "connected", **components}
     except Exception as e:
-        return {"status": "unhealthy", "neo4j": str(e)}
+        return {"status": "unhealthy", "neo4j": str(e), **components}
 
 @app.post("/tools/run_cypher", response_model=Response)
-def run_cypher(request: CypherRequest):
+async def run_cypher(request: CypherRequest):
     """
     Execute arbitrary Cypher query against Neo4j
+    Reads run in read transactions, writes in write transactions (both retried on transient errors)
+    With cache=true, read-only results are served from memory until their TTL or the next write
+    With page_size, returns the first page of a read plus a next_cursor for /tools/fetch_page
+    With stream=true, streams records as NDJSON followed by a {"done": true} summary line
     Returns results as list of dictionaries
     """
-    try:
-        with get_driver().session() as session:
-            result = session.run(request.query, request.parameters)
-            records = [dict(record) for record in result]
+    if request.mode is not None and request.mode not in QUERY_MODES:
+        return Response(success=False, error=f"Unknown mode '{request.mode}' (expected one of {', '.join(QUERY_MODES)})")
+
+    if request.stream or request.page_size is not None:
+        return await run_cypher_incrementally(request)
 
+    key = cache_key(request.query, request.parameters) if request.cache else None
+    if key:
+        hit, records = cypher_cache.get(key)
+        if hit:
             if request.log_execution:
                 log_query_execution(request.query, request.parameters, len(records))
+            return Response(success=True, data=records, cache="hit")
+        generation = cypher_cache.generation
 
-            return Response(success=True, data=records)
+    try:
+        async with get_driver().session() as session:
+            mode, admission = await admit(session, request)
+            records, _ = await execute_query(
+                session, request.query, request.parameters, mode, admission.timeout, request.log_execution
+            )
+
+            cache_state = None
+            if key:
+                cache_state = "miss" if mode == READ else "bypass"
+                if mode == READ:
+                    cypher_cache.put(key, records, generation, request.cache_ttl or CYPHER_CACHE_TTL)
+
+            return Response(success=True, data=records, cache=cache_state, notices=admission.reasons or None)
     except Exception as e:
         return Response(success=False, error=str(e))
 
+async def run_cypher_incrementally(request: CypherRequest):
+    """Page or stream a query's records instead of materializing all of them (never cached)"""
+    if request.page_size is not None and not 0 < request.page_size <= CURSOR_MAX_PAGE_SIZE:
+        return Response(success=False, error=f"page_size must be between 1 and {CURSOR_MAX_PAGE_SIZE}")
+
+    try:
+        async with get_driver().session() as session:
+            mode, admission = await admit(session, request)
+
+        if request.stream:
+            return StreamingResponse(
+                stream_records(request, mode, admission.timeout),
+                media_type="application/x-ndjson"
+            )
+
+        # Cursors hold an open auto-commit result, which can't be retried - reads only
+        if mode != READ:
+            return Response(success=False, error="page_size is only supported for read queries")
+
+        # A cursor's transaction stays open while the caller pages, so only a
+        # downgrade caps it - abandoned cursors are reaped after CURSOR_IDLE_TIMEOUT
+        cursor = await cursors.open(
+            get_driver(), request.query, request.parameters or {}, request.page_size,
+            admission.timeout if admission.downgraded else None
+        )
+        records, next_cursor = await cursors.page(cursor, request.page_size)
+        return Response(success=True, data=records, next_cursor=next_cursor, notices=admission.reasons or None)
+    except Exception as e:
+        return Response(success=False, error=str(e))
+
+async def stream_records(request: CypherRequest, mode: str, timeout: float):
+    """NDJSON lines as the driver yields records - fetch_size bounds how many are held at once"""
+    access_mode = READ_ACCESS if mode == READ else WRITE_ACCESS
+    count = 0
+    summary = None
+    started = time.perf_counter()
+    try:
+        async with get_driver().session(default_access_mode=access_mode, fetch_size=NEO4J_FETCH_SIZE) as session:
+            result = await session.run(Query(request.query, timeout=timeout), request.parameters or {})
+            async for record in result:
+                count += 1
+                yield json.dumps(jsonable_encoder(dict(record)), default=str) + "\n"
+            summary = await result.consume()
+        yield json.dumps({"done": True, "success": True, "count": count}) + "\n"
+    except Exception as e:
+        yield json.dumps({"done": True, "success": False, "count": count, "error": str(e)}) + "\n"
+    finally:
+        # Includes time the client took to read the stream
+        duration_ms = (time.perf_counter() - started) * 1000
+        query_stats.record(
+            request.query, request.parameters, duration_ms, count, summary,
+            error=summary is None, read=mode == READ, timeout=timeout
+        )
+        if mode != READ:
+            after_write(request.query)
+        if request.log_execution:
+            log_query_execution(request.query, request.parameters, count, duration_ms, summary)
+
+@app.post("/tools/run_cypher_batch", response_model=Response)
+async def run_cypher_batch(request: CypherBatchRequest):
+    """
+    Run an ordered list of statements in one write transaction (or one per chunk_size statements)
+    A failure rolls back the whole batch - or, when chunked, the failing chunk only
+    Returns a summary per statement: records, record_count, update counters and duration_ms
+    """
+    statements = request.statements
+    if not statements:
+        return Response(success=False, error="Batch has no statements")
+    if len(statements) > CYPHER_BATCH_MAX_STATEMENTS:
+        return Response(
+            success=False,
+            error=f"Batch of {len(statements)} statements exceeds the limit of {CYPHER_BATCH_MAX_STATEMENTS}"
+        )
+    if request.chunk_size is not None and request.chunk_size < 1:
+        return Response(success=False, error="chunk_size must be at least 1")
+
+    try:
+        async with get_driver().session() as session:
+            # Every distinct statement is checked before anything runs: auto-commit from the
+            # text alone, cost with one (cached) EXPLAIN each - only when the guard is on
+            timeout, notices = QUERY_TIMEOUT, []
+            distinct = {statement.query: statement.parameters for statement in statements}
+            for query in distinct:
+                if is_auto_commit(query):
+                    return Response(
+                        success=False,
+                        error=f"Statement manages its own transactions and can't be batched: {query[:200]}"
+                    )
+            if QUERY_GUARD_ENABLED:
+                for query, parameters in distinct.items():
+                    admission = query_guard.check(query, await explain(session, query, parameters))
+                    timeout = min(timeout, admission.timeout)
+                    notices.extend(admission.reasons)
+
+            try:
+                results = await run_batch(
+                    session,
+                    [(statement.query, statement.parameters) for statement in statements],
+                    request.chunk_size,
+                    timeout
+                )
+            except BatchStatementError as e:
+                record_batch(request, e.committed)
+                rolled_back = "its chunk was rolled back" if request.chunk_size else "the batch was rolled back"
+                return Response(
+                    success=False,
+                    error=f"{e} - {rolled_back}",
+                    data={"failed_index": e.index, "committed": [describe_statement(r) for r in e.committed]}
+                )
+            finally:
+                for query in distinct:
+                    after_write(query)
+
+        record_batch(request, results)
+        return Response(
+            success=True,
+            data=[describe_statement(result) for result in results],
+            notices=notices or None
+        )
+    except Exception as e:
+        return Response(success=False, error=str(e))
+
+def record_batch(request: CypherBatchRequest, results: List[dict]):
+    """Time and log each committed batch statement like a single run_cypher"""
+    for result in results:
+        statement = request.statements[result["index"]]
+        query_stats.record(
+            statement.query, statement.parameters, result["duration_ms"], len(result["records"]), result["summary"]
+        )
+        if request.log_execution:
+            log_query_execution(
+                statement.query, statement.parameters, len(result["records"]), result["duration_ms"], result["summary"]
+            )
+
+def describe_statement(result: dict) -> dict:
+    counters = result["summary"].counters
+    return {
+        "index": result["index"],
+        "records": result["records"],
+        "record_count": len(result["records"]),
+        "counters": {name: getattr(counters, name) for name in COUNTER_NAMES if getattr(counters, name)},
+        "duration_ms": round(result["duration_ms"], 3)
+    }
+
+@app.post("/tools/fetch_page", response_model=Response)
+async def fetch_page(request: CursorRequest):
+    """
+    Fetch the next page of a paginated run_cypher result
+    next_cursor is None once the last page has been returned (the cursor is then closed)
+    """
+    if not 0 < request.page_size <= CURSOR_MAX_PAGE_SIZE:
+        return Response(success=False, error=f"page_size must be between 1 and {CURSOR_MAX_PAGE_SIZE}")
+
+    try:
+        cursor = cursors.get(request.cursor)
+        records, next_cursor = await cursors.page(cursor, request.page_size)
+        return Response(success=True, data=records, next_cursor=next_cursor)
+    except CursorError as e:
+        return Response(success=False, error=str(e))
+    except Exception as e:
+        await cursors.close(request.cursor)
+        return Response(success=False, error=str(e))
+
+@app.post("/tools/close_cursor", response_model=Response)
+async def close_cursor(request: CursorRequest):
+    """Close a paginated result early and release its connection"""
+    return Response(success=True, data={"closed": await cursors.close(request.cursor)})
+
 @app.post("/tools/get_skills", response_model=Response)
-def get_skills():
+async def get_skills():
     """
-    Query all available skills from the graph
+    List all available skills (served from the in-memory skill catalogue)
     Returns skill nodes with their metadata
     """
-    query = """
-    MATCH (s:Skill)
-    RETURN s.name as name,
-           s.language as language,
-           s.description as description,
-           s.code_path as code_path,
-           s.query_template as query_template,
-           s.mcp_compatible as mcp_compatible
-    ORDER BY s.name
-    """
     try:
-        with get_driver().session() as session:
-            result = session.run(query)
-            skills = [dict(record) for record in result]
-            log_query_execution(query, {}, len(skills))
-            return Response(success=True, data=skills)
+        if skill_catalog.loaded_at is None:
+            await skill_catalog.refresh()
+        return Response(success=True, data=[skill.describe() for skill in skill_catalog.skills()])
     except Exception as e:
         return Response(success=False, error=str(e))
 
 @app.post("/tools/execute_skill", response_model=Response)
-def execute_skill(request: SkillExecutionRequest):
+async def execute_skill(request: SkillExecutionRequest):
     """
     Execute a skill by name
+    Skills come from the in-memory catalogue, so a Cypher skill costs one round trip
     For Cypher skills: runs the query template with provided parameters
     For Python skills: delegates to willow-api service
     """
     try:
-        # First, fetch the skill from graph
-        skill_query = """
-        MATCH (s:Skill {name: $name})
-        RETURN s.language as language,
-               s.query_template as query_template,
-               s.code_path as code_path
-        """
-        with get_driver().session() as session:
-            result = session.run(skill_query, {"name": request.name})
-            skill = result.single()
-
-            if not skill:
-                return Response(success=False, error=f"Skill '{request.name}' not found")
-
-            # Handle Cypher skills
-            if skill["language"] == "cypher":
-                query_template = skill["query_template"]
-                result = session.run(query_template, request.parameters)
-                records = [dict(record) for record in result]
-                log_query_execution(query_template, request.parameters, len(records))
-                return Response(success=True, data=records)
-
-            # Handle Python skills (would delegate to willow-api)
-            elif skill["language"] == "python":
-                return Response(
-                    success=False,
-                    error="Python skill execution not yet implemented - use willow-api service"
-                )
+        skill = await skill_catalog.get(request.name)
+
+        if not skill:
+            return Response(success=False, error=f"Skill '{request.name}' not found")
+
+        # Handle Cypher skills
+        if skill.language == "cypher":
+            if skill.template_error:
+                return Response(success=False, error=skill.template_error)
+
+            async with get_driver().session() as session:
+                records, _ = await execute_query(session, skill.query_template, request.parameters, skill.mode)
+            return Response(success=True, data=records)
+
+        # Handle Python skills (delegated to willow-api, which knows them by file name)
+        elif skill.language == "python":
+            skill_name = Path(skill.code_path).stem if skill.code_path else skill.name
+            try:
+                result = await willow_api.execute(skill_name, request.parameters)
+            finally:
+                # The server can't see what a Python skill wrote (log_memory, ingests...), so assume it wrote
+                cypher_cache.invalidate()
+            return Response(
+                success=result.get("success", False),
+                data=result.get("result"),
+                error=result.get("error")
+            )
 
-            else:
-                return Response(success=False, error=f"Unsupported skill language: {skill['language']}")
+        else:
+            return Response(success=False, error=f"Unsupported skill language: {skill.language}")
 
     except Exception as e:
         return Response(success=False, error=str(e))
 
 @app.post("/tools/get_brand_assets", response_model=Response)
-def get_brand_assets(season: Optional[str] = None, active_only: bool = True):
+async def get_brand_assets(season: Optional[str] = None, active_only: bool = True):
     """
     Retrieve brand assets from graph
     Optionally filter by season and active status
@@ -192,20 +509,60 @@ def get_brand_assets(season: Optional[str] = None, active_only: bool = True):
     query = " ".join(query_parts)
 
     try:
-        with get_driver().session() as session:
-            result = session.run(query, params)
-            assets = [dict(record["b"]) for record in result]
-            log_query_execution(query, params, len(assets))
+        async with get_driver().session() as session:
+            records, _ = await execute_query(session, query, params, mode=READ)
+            assets = [dict(record["b"]) for record in records]
             return Response(success=True, data=assets)
     except Exception as e:
         return Response(success=False, error=str(e))
 
+@app.post("/tools/query_stats", response_model=Response)
+async def get_query_stats(sort: str = "total_ms", limit: int = 20):
+    """
+    The most expensive queries, aggregated by fingerprint
+    Sort by total_ms, mean_ms, max_ms, count, errors or rows; slow reads carry a PROFILE summary (db hits)
+    """
+    if sort not in SORT_KEYS:
+        return Response(success=False, error=f"Unknown sort '{sort}' (expected one of {', '.join(SORT_KEYS)})")
+    return Response(success=True, data=query_stats.top(sort, limit))
+
+@app.delete("/admin/query_stats")
+def clear_query_stats():
+    """Reset the per-query timing aggregates"""
+    return {"cleared": query_stats.clear()}
+
+@app.get("/admin/cypher_cache")
+def cypher_cache_stats():
+    """Show result cache size and hit ratio"""
+    return cypher_cache.stats()
+
+@app.delete("/admin/cypher_cache")
+def clear_cypher_cache():
+    """Drop every cached query result"""
+    return {"cleared": cypher_cache.invalidate()}
+
+@app.get("/admin/query_guard")
+def query_guard_stats():
+    """Show admitted / downgraded / rejected counts and recent rejections"""
+    return query_guard.stats()
+
+@app.on_event("startup")
+async def startup_event():
+    """Start the background ExecutionLog writer, idle cursor reaper and skill catalogue refresh"""
+    log_writer.start()
+    cursors.start()
+    skill_catalog.start()
+
 @app.on_event("shutdown")
-def shutdown_event():
-    """Close Neo4j driver on shutdown"""
+async def shutdown_event():
+    """Flush buffered ExecutionLogs, then close Neo4j driver on shutdown"""
     global driver
+    skill_catalog.stop()
+    await willow_api.close()
+    await cursors.close_all()
+    await log_writer.stop()
     if driver:
-        driver.close()
+        await driver.close()
 
 if __name__ == "__main__":
     print(f"Starting Willow Neo4j MCP Server on port {MCP_PORT}")
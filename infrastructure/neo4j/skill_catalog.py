@@ -0,0 +1,149 @@
+"""
+Willow Neo4j MCP Server - Skill Catalogue
+In-memory copy of every :Skill node so execute_skill doesn't look skills up on each call
+"""
+
+import asyncio
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from query_routing import READ, classify, run_query
+
+SKILL_CATALOG_REFRESH_INTERVAL = float(os.getenv("SKILL_CATALOG_REFRESH_INTERVAL", "60"))
+# A lookup miss only reloads the catalogue if it is at least this old (seconds)
+SKILL_CATALOG_MISS_REFRESH = 5
+
+SKILLS_QUERY = """
+MATCH (s:Skill)
+RETURN s.name as name,
+       s.language as language,
+       s.description as description,
+       s.code_path as code_path,
+       s.query_template as query_template,
+       s.mcp_compatible as mcp_compatible
+ORDER BY s.name
+"""
+
+# Writes that mention the Skill label trigger an early refresh
+_SKILL_LABEL = re.compile(r":\s*`?Skill`?\b")
+
+
+@dataclass
+class CatalogSkill:
+    name: str
+    language: Optional[str]
+    description: Optional[str]
+    code_path: Optional[str]
+    query_template: Optional[str]
+    mcp_compatible: Optional[bool]
+    mode: Optional[str] = None  # READ / WRITE for Cypher templates, from the validation EXPLAIN
+    template_error: Optional[str] = None
+
+    def describe(self) -> dict:
+        return {
+            "name": self.name,
+            "language": self.language,
+            "description": self.description,
+            "code_path": self.code_path,
+            "query_template": self.query_template,
+            "mcp_compatible": self.mcp_compatible
+        }
+
+
+def touches_skills(query: str) -> bool:
+    return bool(_SKILL_LABEL.search(query))
+
+
+class SkillCatalog:
+    """
+    Skills loaded from the graph at startup and refreshed every
+    SKILL_CATALOG_REFRESH_INTERVAL seconds, or straight away after a write
+    through this server that mentions :Skill.
+
+    Cypher templates are validated with EXPLAIN the first time they are seen
+    (and again whenever they change), so a broken template is reported
+    without running anything. A name that isn't in the catalogue triggers a
+    refresh before it is reported missing, for skills created elsewhere.
+    """
+
+    def __init__(self, get_driver: Callable):
+        self.get_driver = get_driver
+        self._skills: Dict[str, CatalogSkill] = {}
+        self._refresh_requested = asyncio.Event()
+        self._refresh_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.loaded_at: Optional[float] = None
+
+    async def refresh(self) -> int:
+        """Reload every Skill node. Returns how many skills are in the catalogue."""
+        async with self._refresh_lock:
+            async with self.get_driver().session() as session:
+                rows, _ = await run_query(session, SKILLS_QUERY, mode=READ)
+
+                skills = {}
+                for row in rows:
+                    skill = CatalogSkill(**row)
+                    current = self._skills.get(skill.name)
+                    if current is not None and current.query_template == skill.query_template:
+                        skill.mode, skill.template_error = current.mode, current.template_error
+                    elif skill.language == "cypher":
+                        await self._validate(session, skill)
+                    skills[skill.name] = skill
+
+            self._skills = skills
+            self.loaded_at = time.time()
+            return len(skills)
+
+    async def _validate(self, session, skill: CatalogSkill):
+        if not skill.query_template:
+            skill.template_error = f"Skill '{skill.name}' has no query_template"
+            return
+        try:
+            skill.mode = await classify(session, skill.query_template)
+        except Exception as e:
+            skill.template_error = f"Skill '{skill.name}' has an invalid query_template: {e}"
+
+    async def get(self, name: str) -> Optional[CatalogSkill]:
+        skill = self._skills.get(name)
+        if skill is None and (self.loaded_at is None or time.time() - self.loaded_at > SKILL_CATALOG_MISS_REFRESH):
+            await self.refresh()
+            skill = self._skills.get(name)
+        return skill
+
+    def skills(self) -> List[CatalogSkill]:
+        return [self._skills[name] for name in sorted(self._skills)]
+
+    def request_refresh(self):
+        """Refresh soon, off the request path"""
+        self._refresh_requested.set()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_forever())
+
+    async def _refresh_forever(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Skill catalogue refresh failed: {e}")
+            try:
+                await asyncio.wait_for(self._refresh_requested.wait(), timeout=SKILL_CATALOG_REFRESH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._refresh_requested.clear()
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "skills": len(self._skills),
+            "invalid_templates": sorted(name for name, skill in self._skills.items() if skill.template_error),
+            "loaded_at": self.loaded_at
+        }
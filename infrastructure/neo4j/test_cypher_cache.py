@@ -0,0 +1,29 @@
+"""
+Willow Neo4j MCP Server - Cypher Cache Tests
+Run from infrastructure/neo4j: python -m pytest test_cypher_cache.py
+"""
+
+from cypher_cache import cache_key, fingerprint
+
+
+def test_url_literals_are_not_comments():
+    alpha = "MATCH (s:Site {url: 'http://alpha.com'}) RETURN s"
+    beta = "MATCH (s:Site {url: 'http://beta.com'}) RETURN s.name"
+    assert fingerprint(alpha) == alpha
+    assert cache_key(alpha, None) != cache_key(beta, None)
+
+
+def test_whitespace_inside_literals_is_kept():
+    assert cache_key("RETURN 'a  b'", None) != cache_key("RETURN 'a b'", None)
+    assert fingerprint('RETURN "x\\"  //y"') == 'RETURN "x\\"  //y"'
+    assert fingerprint("MATCH (n) RETURN n.`odd  // name`") == "MATCH (n) RETURN n.`odd  // name`"
+
+
+def test_comments_and_formatting_are_ignored():
+    formatted = """
+        MATCH (n:Memory)  // entry points
+        /* only active */ WHERE n.status = 'Active'
+        RETURN n
+    """
+    assert fingerprint(formatted) == "MATCH (n:Memory) WHERE n.status = 'Active' RETURN n"
+    assert cache_key(formatted, {"a": 1}) == cache_key("MATCH (n:Memory) WHERE n.status = 'Active' RETURN n", {"a": 1})
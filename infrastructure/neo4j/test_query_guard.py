@@ -0,0 +1,52 @@
+"""
+Willow Neo4j MCP Server - Query Guard Tests
+Run from infrastructure/neo4j: python -m pytest test_query_guard.py
+"""
+
+import pytest
+
+from query_guard import QueryGuard, QueryRejectedError, unbounded_expansions, unbounded_in_text
+from query_routing import READ, QueryPlan
+
+
+def plan(*expansions):
+    return QueryPlan(mode=READ, operators=frozenset(op for op, _ in expansions), estimated_rows=10, expansions=expansions)
+
+
+def test_patterns_in_strings_and_comments_are_not_expansions():
+    assert not unbounded_expansions("MATCH (n) WHERE n.text CONTAINS '[*]' RETURN n", plan())
+    query = "MATCH (a)-[*1..3]-(b) RETURN b // not [*]"
+    assert not unbounded_expansions(query, plan(("VarLengthExpand(All)", "(a)-[anon_0*1..3]-(b)")))
+    assert not unbounded_in_text(query)
+
+
+def test_unbounded_expansions_in_the_plan_are_found():
+    assert unbounded_expansions("MATCH (a)-[*]-(b) RETURN b", plan(("VarLengthExpand(All)", "(a)-[anon_0*]-(b)")))
+    assert unbounded_expansions("MATCH (a)-[:R*2..]->(b) RETURN b", plan(("VarLengthExpand(All)", "(a)-[anon_0:R*2..]->(b)")))
+    assert unbounded_expansions(
+        "MATCH (a)-[:R]->+(b) RETURN b",
+        plan(("Repeat(Trail)", "(a) (anon_0)-[anon_1:R]->(anon_2){1, *} (b)"))
+    )
+    assert not unbounded_expansions(
+        "MATCH (a) ((x)-[:R]->(y)){1,3} (b) RETURN b",
+        plan(("Repeat(Trail)", "(a) (x)-[anon_0:R]->(y){1, 3} (b)"))
+    )
+
+
+def test_text_fallback_covers_quantified_patterns():
+    assert unbounded_in_text("MATCH (a)-[:R]->+(b) RETURN b")
+    assert unbounded_in_text("MATCH (()-[:R]->()){1,} RETURN 1")
+    assert not unbounded_in_text("MATCH (()-[:R]->()){1,4} RETURN 1")
+    assert unbounded_expansions("MATCH (a)-[*]-(b) RETURN b", plan(("VarLengthExpand(All)", "")))
+
+
+def test_shortest_path_only_exempts_its_own_pattern():
+    assert not unbounded_in_text("MATCH p = shortestPath((a)-[*]-(b)) RETURN p")
+    assert unbounded_in_text("MATCH p = shortestPath((a)-[*]-(b)) MATCH (b)-[*]-(c) RETURN c")
+
+
+def test_guard_rejects_unbounded_expansion():
+    guard = QueryGuard()
+    with pytest.raises(QueryRejectedError):
+        guard.check("MATCH (a)-[*]-(b) RETURN b", plan(("VarLengthExpand(All)", "(a)-[anon_0*]-(b)")))
+    assert guard.check("MATCH (n) WHERE n.text CONTAINS '[*]' RETURN n", plan()).timeout
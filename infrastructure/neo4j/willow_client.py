@@ -0,0 +1,77 @@
+"""
+Willow Neo4j MCP Server - Willow API Client
+Pooled keep-alive HTTP client used to hand Python skills to willow-api
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, Optional
+
+import httpx
+
+WILLOW_API_URL = os.getenv("WILLOW_API_URL", "http://willow-api:8000")
+# Read timeout - must stay above the largest SKILL_CONFIG timeout in willow-api (600s for the
+# ingest skills), or the call gives up while the skill is still running
+WILLOW_API_TIMEOUT = float(os.getenv("WILLOW_API_TIMEOUT", "660"))
+WILLOW_API_CONNECT_TIMEOUT = float(os.getenv("WILLOW_API_CONNECT_TIMEOUT", "5"))
+WILLOW_API_MAX_CONNECTIONS = int(os.getenv("WILLOW_API_MAX_CONNECTIONS", "20"))
+WILLOW_API_RETRIES = int(os.getenv("WILLOW_API_RETRIES", "2"))
+
+# Responses meaning willow-api never got to run the skill (restarting, proxy in between) - safe to retry.
+# Not 504: a gateway timeout can come after the skill ran, and re-running a write skill duplicates it.
+_RETRY_STATUSES = {502, 503}
+
+
+class WillowApiClient:
+    """
+    Forwards skill calls to willow-api's /execute
+
+    One httpx.AsyncClient is shared by every request, so connections are
+    pooled and kept alive instead of paying a TCP handshake per call. Only
+    failures where the skill can't have started (connection refused/timed out,
+    502/503) are retried - a skill that timed out mid-run is not re-run.
+    """
+
+    def __init__(self, base_url: str = WILLOW_API_URL):
+        self.base_url = base_url
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(WILLOW_API_TIMEOUT, connect=WILLOW_API_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=WILLOW_API_MAX_CONNECTIONS,
+                    max_keepalive_connections=WILLOW_API_MAX_CONNECTIONS
+                )
+            )
+        return self._client
+
+    async def execute(self, skill_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a skill in willow-api
+
+        Returns:
+            willow-api's SkillExecutionResponse body (success, result, error, skill_name)
+        """
+        payload = {"skill_name": skill_name, "parameters": parameters or {}}
+
+        for attempt in range(WILLOW_API_RETRIES + 1):
+            last_attempt = attempt == WILLOW_API_RETRIES
+            try:
+                response = await self._http().post("/execute", json=payload)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                if last_attempt:
+                    raise
+            else:
+                if response.status_code not in _RETRY_STATUSES or last_attempt:
+                    response.raise_for_status()
+                    return response.json()
+
+            await asyncio.sleep(0.2 * 2 ** attempt)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None